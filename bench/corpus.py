@@ -0,0 +1,250 @@
+"""
+Synthetic paper generator for benchmarks.
+
+Writes realistic-looking nanotoxicology papers with PyMuPDF: a large-font
+title wrapped over several lines, an author line, abstract and keywords block, a methods
+section with DLS / zeta / BET / TEM sentences, characterization tables,
+filler results text up to the requested page count, and a references section.
+Output is deterministic for a given seed.
+
+    python -m bench.corpus --out bench_corpus --n 50 --pages 12
+"""
+import argparse
+import os
+import random
+
+import fitz  # pymupdf
+
+PAGE_W, PAGE_H = 595, 842  # A4 in points
+MARGIN = 60
+BODY_SIZE = 9.5
+
+MATERIALS = [
+    ("TiO2", "titanium dioxide nanoparticles", "anatase"),
+    ("ZnO", "zinc oxide nanoparticles", "wurtzite"),
+    ("CeO2", "cerium oxide nanoparticles", "fluorite"),
+    ("SiO2", "amorphous silica nanoparticles", "amorphous"),
+    ("Fe3O4", "magnetite nanoparticles", "spinel"),
+    ("Ag", "silver nanoparticles", "fcc"),
+    ("Au", "gold nanoparticles", "fcc"),
+    ("MWCNT", "multi-walled carbon nanotubes", "graphitic"),
+    ("graphene oxide", "graphene oxide nanosheets", "layered"),
+]
+CELLS = ["A549", "BEAS-2B", "HepG2", "THP-1", "RAW 264.7", "Caco-2", "HaCaT"]
+MEDIA = ["DMEM", "RPMI", "PBS"]
+MORPHOLOGIES = ["spherical", "rod-shaped", "irregular", "cubic", "plate-like"]
+SUPPLIERS = ["Sigma-Aldrich", "Nanostructured & Amorphous Materials", "US Research Nanomaterials", "Evonik"]
+JOURNALS = ["Nanotoxicology", "Particle and Fibre Toxicology", "Toxicology in Vitro", "ACS Nano"]
+SURNAMES = ["Smith", "Garcia", "Chen", "Müller", "Rossi", "Kowalski", "Nakamura", "Dubois", "Silva", "Novak"]
+
+FILLER = (
+    "Cells were exposed for 24 h to increasing concentrations of the particles and the response was "
+    "compared with untreated controls. The dose-response relationship was fitted with a four-parameter "
+    "logistic model and differences between groups were assessed by one-way ANOVA followed by Tukey's "
+    "post hoc test. Agglomeration in the exposure medium changes the delivered dose, which we estimated "
+    "from sedimentation measurements taken at the start and the end of the exposure period. "
+)
+
+
+def _paper(rng: random.Random, idx: int) -> dict:
+    core, name, phase = rng.choice(MATERIALS)
+    cell = rng.choice(CELLS)
+    medium = rng.choice(MEDIA)
+    dls_w = rng.randint(40, 300)
+    return {
+        "core": core,
+        "name": name,
+        "phase": phase,
+        "cell": cell,
+        "medium": medium,
+        "title": f"Cytotoxicity and oxidative stress of {name} in {cell} cells: "
+                 f"the role of agglomeration in {medium}",
+        "authors": ", ".join(f"{rng.choice('ABCDEFGHJKLMNPRS')}. {rng.choice(SURNAMES)}" for _ in range(rng.randint(3, 7))),
+        "journal": rng.choice(JOURNALS),
+        "year": rng.randint(2008, 2024),
+        "doi": f"10.{rng.randint(1000, 9999)}/bench.{idx:05d}",
+        "keywords": [core, "nanotoxicology", "oxidative stress", "cell viability", cell],
+        "dls_water": dls_w,
+        "dls_medium": dls_w + rng.randint(20, 400),
+        "pdi": round(rng.uniform(0.08, 0.5), 2),
+        "zeta_water": -round(rng.uniform(5, 45), 1),
+        "zeta_medium": -round(rng.uniform(3, 15), 1),
+        "bet": rng.randint(10, 300),
+        "tem": rng.randint(5, 80),
+        "morphology": rng.choice(MORPHOLOGIES),
+        "purity": round(rng.uniform(95, 99.99), 2),
+        "supplier": rng.choice(SUPPLIERS),
+        "endotoxin": round(rng.uniform(0.01, 0.5), 2),
+        "viability": rng.randint(20, 95),
+    }
+
+
+class _Writer:
+    """
+    Flows paragraphs down the page and onto new pages.
+    """
+
+    def __init__(self, doc: fitz.Document):
+        self.doc = doc
+        self.page = None
+        self.y = PAGE_H
+        self.new_page()
+
+    def new_page(self):
+        self.page = self.doc.new_page(width=PAGE_W, height=PAGE_H)
+        self.y = MARGIN
+
+    def line(self, text: str, size: float = BODY_SIZE, font: str = "helv", gap: float = 4):
+        if self.y + size > PAGE_H - MARGIN:
+            self.new_page()
+        self.page.insert_text((MARGIN, self.y + size), text, fontsize=size, fontname=font)
+        self.y += size * 1.3 + gap
+
+    def paragraph(self, text: str, size: float = BODY_SIZE, font: str = "helv"):
+        # insert_textbox returns the unused height, or a negative value (and
+        # writes nothing) when the text does not fit the rectangle.
+        if self.y > PAGE_H - MARGIN - 2 * size:
+            self.new_page()
+        for _ in range(2):
+            rect = fitz.Rect(MARGIN, self.y, PAGE_W - MARGIN, PAGE_H - MARGIN)
+            spare = self.page.insert_textbox(rect, text, fontsize=size, fontname=font)
+            if spare >= 0:
+                self.y = rect.y1 - spare + 6
+                return
+            self.new_page()
+        raise ValueError("paragraph longer than a page")
+
+    def wrapped(self, text: str, size: float, font: str, gap: float = 4):
+        # One line() per visual line, so every title line is its own span
+        width = PAGE_W - 2 * MARGIN
+        line = ""
+        for word in text.split():
+            trial = f"{line} {word}".strip()
+            if line and fitz.get_text_length(trial, fontname=font, fontsize=size) > width:
+                self.line(line, size=size, font=font, gap=2)
+                line = word
+            else:
+                line = trial
+        self.line(line, size=size, font=font, gap=gap)
+
+    def heading(self, text: str):
+        self.y += 6
+        self.line(text, size=11.5, font="hebo", gap=2)
+
+    def table(self, caption: str, rows: list[list[str]]):
+        height = (len(rows) + 2) * 14 + 10
+        if self.y + height > PAGE_H - MARGIN:
+            self.new_page()
+        self.line(caption, size=8.5, font="hebo")
+        col_x = [MARGIN, MARGIN + 200, MARGIN + 330]
+        for row in rows:
+            for x, cell in zip(col_x, row):
+                self.page.insert_text((x, self.y + 8.5), cell, fontsize=8.5)
+            self.y += 13
+        self.y += 10
+
+
+def write_paper(path: str, pages: int = 8, seed: int = 0, idx: int = 0):
+    """
+    Write one synthetic paper with about `pages` pages to `path`.
+    """
+    rng = random.Random(seed * 100003 + idx)
+    p = _paper(rng, idx)
+    doc = fitz.open()
+    w = _Writer(doc)
+
+    w.line(f"{p['journal']} ({p['year']})  https://doi.org/{p['doi']}", size=8)
+    w.y += 20
+    # Long title, wrapped over several large-font lines
+    w.wrapped(p["title"], size=18, font="hebo", gap=10)
+    w.line(p["authors"], size=10)
+    w.line("Department of Toxicology, Example University, 1 Science Road, Example City", size=8, gap=16)
+
+    w.heading("Abstract")
+    w.paragraph(
+        f"The growing use of {p['name']} raises concerns about their effects on human health. "
+        f"We characterized {p['core']} particles in water and in {p['medium']} and exposed {p['cell']} "
+        f"cells for 24 h. Cell viability decreased to {p['viability']}% at the highest dose and reactive "
+        f"oxygen species (ROS) increased in a dose-dependent manner."
+    )
+    w.line("Keywords: " + "; ".join(p["keywords"]), gap=10)
+
+    w.heading("1. Introduction")
+    w.paragraph(FILLER * 2)
+
+    w.heading("2. Materials and methods")
+    w.heading("2.1 Nanomaterial characterization")
+    w.paragraph(
+        f"{p['core']} nanoparticles ({p['phase']}, purity {p['purity']}%) were purchased from {p['supplier']}. "
+        f"Particles were dispersed in water by probe sonication and diluted in {p['medium']}. "
+        f"The DLS hydrodynamic diameter in water was {p['dls_water']} nm with a PDI of {p['pdi']}, "
+        f"while the DLS diameter in {p['medium']} medium was {p['dls_medium']} nm. "
+        f"The zeta potential in water was {p['zeta_water']} mV and the zeta potential in {p['medium']} medium "
+        f"was {p['zeta_medium']} mV. The BET surface area was {p['bet']} m2/g. "
+        f"TEM images showed {p['morphology']} particles and the TEM diameter was {p['tem']} nm. "
+        f"Endotoxin content was {p['endotoxin']} EU/mg."
+    )
+    w.table(f"Table 1. Physicochemical characterization of {p['core']}.", [
+        ["Property", "Method", "Value"],
+        ["Primary size", "TEM", f"{p['tem']} nm"],
+        ["Hydrodynamic size (water)", "DLS", f"{p['dls_water']} nm"],
+        ["PDI", "DLS", f"{p['pdi']}"],
+        ["Zeta potential (water)", "ELS", f"{p['zeta_water']} mV"],
+        ["Specific surface area", "BET", f"{p['bet']} m2/g"],
+        ["Purity", "Supplier", f"{p['purity']} %"],
+    ])
+    w.heading("2.2 Cell culture and exposure")
+    w.paragraph(
+        f"{p['cell']} cells were cultured in {p['medium']} supplemented with 10% FBS. "
+        f"Cell viability was measured with the WST-1 assay and ROS with the DCFH-DA probe. " + FILLER
+    )
+
+    w.heading("3. Results and discussion")
+    w.table("Table 2. Viability after 24 h exposure.", [
+        ["Dose (ug/mL)", "Viability (%)", "ROS (fold)"],
+        *[[str(d), str(max(p["viability"], 100 - d // 2)), f"{1 + d / 50:.1f}"] for d in (5, 10, 25, 50, 100)],
+    ])
+    # Filler up to the requested length, keeping the last page for references
+    while len(doc) < max(pages - 1, 2):
+        w.paragraph(FILLER * rng.randint(1, 3))
+
+    w.new_page()
+    w.heading("References")
+    for i in range(1, 31):
+        w.line(
+            f"[{i}] {rng.choice(SURNAMES)} {rng.choice('ABCDEFG')}, {rng.choice(SURNAMES)} {rng.choice('HJKLMN')}. "
+            f"{rng.choice(JOURNALS)} {rng.randint(2000, 2023)};{rng.randint(1, 40)}:{rng.randint(1, 900)}.",
+            size=8, gap=1,
+        )
+
+    doc.set_metadata({"title": p["title"], "author": p["authors"], "creator": "bench.corpus"})
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+
+def make_corpus(out_dir: str, n: int = 20, pages: int = 8, seed: int = 0) -> list[str]:
+    """
+    Write `n` papers into `out_dir` (created if needed) and return their paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for i in range(n):
+        path = os.path.join(out_dir, f"paper_{i:04d}.pdf")
+        write_paper(path, pages=pages, seed=seed, idx=i)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a synthetic PDF corpus for benchmarks.")
+    ap.add_argument("--out", type=str, required=True, help="Output directory.")
+    ap.add_argument("--n", type=int, default=20, help="Number of papers.")
+    ap.add_argument("--pages", type=int, default=8, help="Approximate pages per paper.")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed (same seed, same corpus).")
+    args = ap.parse_args(argv)
+    paths = make_corpus(args.out, n=args.n, pages=args.pages, seed=args.seed)
+    print(f"Wrote {len(paths)} PDFs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
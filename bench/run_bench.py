@@ -0,0 +1,178 @@
+"""
+Benchmark suite: microbenchmarks for the hot extractors plus an end-to-end
+run_pipeline throughput benchmark, on a synthetic corpus (bench.corpus).
+
+Results are compared with stored baselines (bench/baselines.json) and any
+benchmark slower than baseline * (1 + tolerance) fails the run with exit 1.
+Baselines are per machine. A fixed pure-Python calibration loop is timed with
+every run and reported; --normalize scales baselines by it when comparing
+with numbers recorded elsewhere (less precise: the loop itself is noisy).
+
+    python -m bench.run_bench                  # compare with baselines
+    python -m bench.run_bench --update         # record new baselines
+    python -m bench.run_bench --only extract_table_rows
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+from bench.corpus import make_corpus
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+
+def measure(fn, min_time: float = 0.2, repeat: int = 5) -> float:
+    """
+    Best-of-`repeat` seconds per call, with the loop count chosen so one
+    repeat takes at least `min_time`.
+    """
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - t0 >= min_time:
+            break
+        loops *= 2
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / loops)
+    return best
+
+
+def _calibration():
+    # Fixed mix of the work the extractors do: string scanning, regex, dicts
+    text = "zeta potential of -25 mV and DLS diameter 120 nm; " * 200
+    rx = re.compile(r"(-?\d+(?:\.\d+)?)\s*(nm|mV)")
+    counts = {}
+    for m in rx.finditer(text):
+        counts[m.group(2)] = counts.get(m.group(2), 0) + 1
+    sorted(text.split())
+
+
+def micro_benchmarks(pdf_path: str) -> dict:
+    """
+    name -> zero-argument callable, with inputs prepared the way the runner
+    prepares them (first pages text, references removed full text, page dict).
+    """
+    from extract.io.pdf_reader import (
+        extract_first_page_dict, extract_pdf_text_all_pages, extract_pdf_text_first_pages, join_pages,
+    )
+    from extract.utils.text import remove_references
+    from extract.extractors.nanomaterial import extract_core_compositions
+    from extract.extractors.characterization_regex import extract_characterization_regex
+    from extract.extractors.metadata import extract_title_from_first_page_layout
+    from extract.extractors.table_extractor import extract_table_rows
+    from extract.utils.snippets import extract_descriptor_snippets
+
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    text_meta = join_pages(extract_pdf_text_first_pages(data, max_pages=3))
+    text_full = remove_references(join_pages(extract_pdf_text_all_pages(data)))
+    page_dict = extract_first_page_dict(data)
+
+    return {
+        "extract_core_compositions": lambda: extract_core_compositions(text_full),
+        "extract_characterization_regex": lambda: extract_characterization_regex(text_full),
+        "extract_title_from_first_page_layout": lambda: extract_title_from_first_page_layout(page_dict),
+        "extract_table_rows": lambda: extract_table_rows(data),
+        "extract_descriptor_snippets": lambda: extract_descriptor_snippets(text_meta),
+    }
+
+
+def end_to_end(pdf_dir: str, n: int) -> float:
+    """
+    Seconds per PDF for a full run_pipeline run (rules only, JSONL output).
+    """
+    from extract.pipeline.runner import run_pipeline
+
+    best = float("inf")
+    for _ in range(2):
+        with tempfile.TemporaryDirectory() as out:
+            t0 = time.perf_counter()
+            run_pipeline(
+                pdf_dir=pdf_dir, use_llm=False, llm_model="", sqlite_db_path=None,
+                excel_path=None, jsonl_path=os.path.join(out, "bench.jsonl"),
+            )
+            best = min(best, (time.perf_counter() - t0) / n)
+    return best
+
+
+def _fmt(seconds: float) -> str:
+    return f"{seconds * 1000:.3f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Run extractor and pipeline benchmarks against stored baselines.")
+    ap.add_argument("--baseline", type=str, default=BASELINES, help="Baselines JSON file.")
+    ap.add_argument("--update", action="store_true", help="Record current results as the new baselines.")
+    ap.add_argument("--tolerance", type=float, default=0.3, help="Allowed slowdown before failing (0.3 = 30%%).")
+    ap.add_argument("--normalize", action="store_true", help="Scale baselines by the calibration loop (other machines).")
+    ap.add_argument("--only", type=str, default=None, help="Run only benchmarks whose name contains this.")
+    ap.add_argument("--n", type=int, default=20, help="Papers in the end-to-end corpus.")
+    ap.add_argument("--pages", type=int, default=10, help="Pages per synthetic paper.")
+    args = ap.parse_args(argv)
+
+    logging.getLogger("extract").setLevel(logging.WARNING)
+
+    results = {}
+    calibration = measure(_calibration, repeat=10)
+    with tempfile.TemporaryDirectory() as corpus:
+        paths = make_corpus(corpus, n=args.n, pages=args.pages, seed=0)
+        for name, fn in micro_benchmarks(paths[0]).items():
+            if not args.only or args.only in name:
+                results[name] = measure(fn)
+        if not args.only or args.only in "run_pipeline_per_pdf":
+            results["run_pipeline_per_pdf"] = end_to_end(corpus, len(paths))
+    # again at the end: CPU frequency often changes during a run
+    calibration = min(calibration, measure(_calibration, repeat=10))
+
+    if args.update or not os.path.exists(args.baseline):
+        stored = {"calibration": calibration, "benchmarks": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                stored = json.load(f)
+            stored["calibration"] = calibration
+        stored["benchmarks"].update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        for name, secs in results.items():
+            print(f"{name:<40}{_fmt(secs):>14}")
+        print(f"Baselines written to {args.baseline}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        stored = json.load(f)
+    speed = stored["calibration"] / calibration
+    print(f"machine speed vs baseline: {speed:.2f}x" + ("" if args.normalize else " (not applied, see --normalize)"))
+    scale = 1 / speed if args.normalize else 1.0
+    print(f"{'benchmark':<40}{'now':>14}{'baseline':>14}{'change':>9}")
+
+    failed = []
+    for name, secs in results.items():
+        base = stored["benchmarks"].get(name)
+        if base is None:
+            print(f"{name:<40}{_fmt(secs):>14}{'-':>14}{'new':>9}")
+            continue
+        base *= scale
+        change = secs / base - 1
+        print(f"{name:<40}{_fmt(secs):>14}{_fmt(base):>14}{change:>+9.0%}")
+        if change > args.tolerance:
+            failed.append((name, change))
+
+    for name, change in failed:
+        print(f"REGRESSION: {name} is {change:.0%} slower than its baseline")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
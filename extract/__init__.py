@@ -0,0 +1,9 @@
+# Public API, loaded on first use so `import extract.cli` stays fast.
+__all__ = ["extract_document", "extract_many", "ExtractOptions", "Result"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        from extract import api
+        return getattr(api, name)
+    raise AttributeError(f"module 'extract' has no attribute {name!r}")
@@ -0,0 +1,184 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator
+
+from extract.extractors.triage import TriagePolicy
+from extract.records import ExtractionResult
+from extract.utils.hashing import sha256_bytes
+from extract.pipeline.plan import resolve_plan
+from extract.pipeline.runner import process_pdf
+
+# Library entry points: extraction without a PDF directory, output files or
+# logging side effects.
+#
+#   from extract import extract_document, extract_many
+#   result = extract_document("paper.pdf")
+#   for result in extract_many(paths_or_bytes, workers=4):
+#       ...
+
+
+class ExtractOptions:
+    """
+    Settings for extract_document / extract_many. `keep_pages=True` keeps
+    the full page texts on the result (needed to store searchable text).
+    `stages` / `fields` limit extraction as in extract.pipeline.plan.
+    `triage_threshold` extracts only the metadata of papers scoring below
+    it (extract.extractors.triage).
+    """
+
+    def __init__(
+        self,
+        use_llm: bool = False,
+        llm_model: str = "stub-model",
+        max_pages: int = 3,
+        keep_pages: bool = False,
+        stages: list[str] | None = None,
+        fields: list[str] | None = None,
+        triage_threshold: int | None = None,
+    ):
+        self.use_llm = use_llm
+        self.llm_model = llm_model
+        self.max_pages = max_pages
+        self.keep_pages = keep_pages
+        self.stages = stages
+        self.fields = fields
+        self.triage_threshold = triage_threshold
+
+
+class Result:
+    """
+    One document's extraction. `error` is set (and the record fields are
+    empty) when extract_many could not process the document.
+    """
+
+    __slots__ = ("source", "file_hash", "paper", "nanomaterial", "bio_effects", "pages", "error")
+
+    def __init__(self, source: str, file_hash: str | None, result: ExtractionResult | None = None,
+                 pages: list[dict] | None = None, error: BaseException | None = None):
+        result = result or ExtractionResult.from_dict({})
+        self.source = source
+        self.file_hash = file_hash
+        self.paper = result.paper
+        self.nanomaterial = result.nanomaterial
+        self.bio_effects = result.bio_effects
+        self.pages = pages
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict:
+        """
+        The pipeline's {paper, nanomaterial, bio_effects} result, as written
+        to JSONL and returned by the HTTP service.
+        """
+        return {"paper": self.paper.to_dict(), "nanomaterial": self.nanomaterial.to_dict(),
+                "bio_effects": self.bio_effects.to_dict()}
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"Result({self.source!r}, {status})"
+
+
+def _load(source, name: str | None) -> tuple[bytes, str]:
+    # (pdf bytes, name recorded as file_path); the hash is taken from these bytes
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source), name or "<memory>"
+    path = os.fspath(source)
+    with open(path, "rb") as f:
+        return f.read(), name or path
+
+
+def extract_document(source, options: ExtractOptions | None = None, name: str | None = None) -> Result:
+    """
+    Extract one PDF given as a path or as bytes (opened in memory, no temp
+    file). `name` replaces the recorded file_path. Raises on unreadable PDFs.
+    """
+    options = options or ExtractOptions()
+    data, name = _load(source, name)
+    file_hash = sha256_bytes(data)
+    triage = TriagePolicy(options.triage_threshold) if options.triage_threshold is not None else None
+    result, pages_all = process_pdf(
+        data, name, file_hash,
+        use_llm=options.use_llm, llm_model=options.llm_model, max_pages=options.max_pages,
+        plan=resolve_plan(options.stages, options.fields, use_llm=options.use_llm, triage=triage is not None),
+        triage=triage,
+    )
+    return Result(name, file_hash, result, pages=pages_all if options.keep_pages else None)
+
+
+def _extract_safe(source, options: ExtractOptions, name: str | None) -> Result:
+    try:
+        return extract_document(source, options, name)
+    except Exception as e:
+        return Result(_label(source, name), None, error=e)
+
+
+def _label(source, name: str | None) -> str:
+    return os.fspath(name or (source if isinstance(source, (str, os.PathLike)) else "<memory>"))
+
+
+def _split_item(item) -> tuple[object, str | None]:
+    # items are paths, bytes, or (name, bytes) pairs
+    if isinstance(item, tuple):
+        name, source = item
+        return source, name
+    return item, None
+
+
+def extract_many(
+    sources: Iterable,
+    workers: int | None = None,
+    options: ExtractOptions | None = None,
+    max_pending: int | None = None,
+) -> Iterator[Result]:
+    """
+    Extract a stream of PDFs (paths, bytes or (name, bytes) pairs) and yield
+    a Result for each as soon as it completes, so output order is not input
+    order. Failures are yielded with `error` set instead of raising.
+
+    workers=1 runs in this process; otherwise a process pool of `workers`
+    (default: CPU count). At most `max_pending` documents (default 2 per
+    worker) are in flight, so a long or endless input is read lazily. A
+    worker that dies (segfault, OOM) fails the documents it was sharing the
+    pool with; the pool is then replaced and the stream goes on.
+    """
+    options = options or ExtractOptions()
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1:
+        for item in sources:
+            source, name = _split_item(item)
+            yield _extract_safe(source, options, name)
+        return
+
+    max_pending = max_pending or 2 * workers
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: dict = {}  # future -> (source name, pool it ran on)
+
+    def collect(done) -> Iterator[Result]:
+        nonlocal pool
+        for fut in done:
+            label, fut_pool = pending.pop(fut)
+            try:
+                yield fut.result()
+            except BrokenProcessPool as e:
+                if fut_pool is pool:
+                    pool.shutdown(wait=False)
+                    pool = ProcessPoolExecutor(max_workers=workers)
+                yield Result(label, None, error=e)
+
+    try:
+        for item in sources:
+            source, name = _split_item(item)
+            pending[pool.submit(_extract_safe, source, options, name)] = (_label(source, name), pool)
+            if len(pending) >= max_pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from collect(done)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            yield from collect(done)
+    finally:
+        pool.shutdown()
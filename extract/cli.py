@@ -1,25 +1,254 @@
 import argparse
-from extract.pipeline.runner import run_pipeline
+import sys
+
+from extract.utils.logs import setup_logging
+
+# Command modules are imported inside their handlers: the CLI is started
+# thousands of times by job schedulers and heavy dependencies (PyMuPDF,
+# openpyxl, requests, pyarrow) should only load for the commands that use them.
+# scripts/check_import_time.py guards this.
 
 def build_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(
         description="Extract paper metadata + nanomaterial identity from PDFs (prototype)."
     )
-    ap.add_argument("--pdf_dir", type=str, required=True, help="Directory containing PDF files")
+    ap.add_argument("--pdf_dir", type=str, default=None, help="Directory containing PDF files")
+    ap.add_argument("--recursive", action="store_true", help="Also find PDFs in subdirectories of --pdf_dir.")
+    ap.add_argument("--include", action="append", default=None, help="Glob for files to process (repeatable, default: *.pdf). Matched against the path relative to --pdf_dir or the file name, case-insensitive.")
+    ap.add_argument("--exclude", action="append", default=None, help="Glob for files or directories to skip (repeatable).")
+    ap.add_argument("--symlinks", choices=["skip", "files", "follow"], default="files", help="skip links, follow links to files only (default), or also enter linked directories.")
+    ap.add_argument("--max_file_mb", type=float, default=None, help="Skip files larger than this many MB.")
+    ap.add_argument("--archives", action="store_true", help="Also read PDFs inside zip / tar(.gz/.bz2/.xz) files found in --pdf_dir, without unpacking them.")
+    ap.add_argument("--manifest", type=str, default=None, help="Process the paths listed in this file (one per line) instead of scanning --pdf_dir.")
+    ap.add_argument("--shard", type=str, default=None, help="i/N: process only shard i (0-based) of N, chosen by a stable hash of each file's relative path.")
+    ap.add_argument("--stages", type=str, default=None, help="Only run these output stages, comma-separated: metadata, nanomaterial, characterization, bio_effects.")
+    ap.add_argument("--fields", type=str, default=None, help="Only compute the stages that fill these fields, comma-separated (e.g. doi,year or nanomaterial.core_compositions).")
+    ap.add_argument("--triage", action="store_true", help="Score title, keywords and abstract for nanomaterial terms first; papers below --triage_threshold only get metadata.")
+    ap.add_argument("--triage_threshold", type=int, default=2, help="Least relevance score for full extraction with --triage (default: 2).")
+    ap.add_argument("--triage_keep", type=str, default=None, help="File of paths, file hashes or DOIs (one per line) that --triage always extracts fully.")
+    ap.add_argument("--dedup", action="store_true", help="Link preprints / manuscripts / publisher copies of one paper (same DOI or similar first page) to a single canonical record instead of extracting each.")
+    ap.add_argument("--dedup_threshold", type=float, default=0.8, help="Least first-page MinHash similarity (0-1) for --dedup to treat two files as one paper (default: 0.8).")
     ap.add_argument("--llm", action="store_true", help="Enable hybrid extraction (rules -> LLM refine)")
     ap.add_argument("--llm_model", type=str, default="stub-model", help="LLM model name (used if --llm)")
     ap.add_argument("--database", type=str, default=None, help="SQLite DB path. If set, results saved to SQLite.")
-    ap.add_argument("--excel", type=str, default="results.xlsx", help="Excel output path if SQLite is not used.")
-    ap.add_argument("--max_pages", type=int, default=3, help="Max PDF pages to read for prototype extraction.")
+    ap.add_argument("--recompute", action="store_true", help="With --database: recompute every stage instead of reusing stored outputs of unchanged extractor versions.")
+    ap.add_argument("--excel", type=str, default=None, help="Excel output path if SQLite is not used (default: results.xlsx unless --parquet/--jsonl is set).")
+    ap.add_argument("--parquet", type=str, default=None, help="Also write typed results to this Parquet file (requires pyarrow).")
+    ap.add_argument("--max_pages", type=int, default=3, help="Most front pages scanned for metadata; scanning stops early once DOI, year, keywords and article type are found.")
+    ap.add_argument("--jsonl", type=str, default=None, help="Append each result to this crash-safe JSONL stream.")
+    ap.add_argument("--prefetch", type=int, default=4, help="How many PDFs to read ahead in the background.")
+    ap.add_argument("--timings", type=str, default=None, help="Write per-PDF stage timings to this .csv (or JSON lines) file.")
+    ap.add_argument("--profile", type=int, default=0, help="Dump cProfile stats for the N slowest PDFs.")
+    ap.add_argument("--profile_dir", type=str, default="profiles", help="Directory for --profile .prof files.")
+    ap.add_argument("--regex_stats", action="store_true", help="Count calls, hits and time per extractor regex and print a ranking.")
+    ap.add_argument("--log_level", type=str, default="INFO", help="DEBUG, INFO, WARNING or ERROR.")
+    ap.add_argument("--log_format", choices=["text", "json"], default="text", help="Log line format (json for log collectors).")
+    ap.add_argument("--debug_dumps", action="store_true", help="Also log page text and raw LLM output for every paper (large).")
+    ap.add_argument("--resume", action="store_true", help="Resume an interrupted run: keep rows already written and skip their PDFs.")
     return ap
 
-def main():
-    args = build_parser().parse_args()
+def build_compact_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="compact",
+        description="Remove duplicate per-paper rows left by older non-idempotent runs.",
+    )
+    ap.add_argument("--database", type=str, required=True, help="SQLite DB path to compact in place.")
+    return ap
+
+def cmd_compact(args: argparse.Namespace):
+    from extract.db.sqlite import init_sqlite, compact_sqlite
+    conn = init_sqlite(args.database)
+    removed = compact_sqlite(conn)
+    conn.close()
+    print(f"Compacted {args.database}: removed {removed} duplicate rows")
+
+def build_search_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="search",
+        description="Full-text search over paper text stored by runs with --database.",
+    )
+    ap.add_argument("query", type=str, help="FTS5 query, e.g. 'zeta NEAR/5 potential' or '\"hydrodynamic diameter\"'")
+    ap.add_argument("--database", type=str, required=True, help="SQLite DB path.")
+    ap.add_argument("--section", type=str, default=None, help="Restrict to one section (e.g. methods, results, abstract).")
+    ap.add_argument("--limit", type=int, default=20, help="Max hits to print.")
+    return ap
+
+def cmd_search(args: argparse.Namespace):
+    from extract.db.sqlite import init_sqlite, search_text
+    conn = init_sqlite(args.database)
+    hits = search_text(conn, args.query, limit=args.limit, section=args.section)
+    conn.close()
+    for h in hits:
+        snippet = " ".join(h["snippet"].split())
+        print(f"{h['file_path']} p.{h['page']} [{h['section']}]: {snippet}")
+    if not hits:
+        print("No matches.")
+
+def build_export_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="export",
+        description="Build Excel and/or Parquet outputs from a JSONL result stream.",
+    )
+    ap.add_argument("--jsonl", type=str, required=True, help="JSONL stream written by a run with --jsonl.")
+    ap.add_argument("--excel", type=str, default=None, help="Excel output path.")
+    ap.add_argument("--parquet", type=str, default=None, help="Parquet output path (requires pyarrow).")
+    return ap
+
+def cmd_export(args: argparse.Namespace):
+    setup_logging()
+    if not (args.excel or args.parquet):
+        raise SystemExit("export: give --excel and/or --parquet")
+    from extract.pipeline.outputs import export_jsonl
+    export_jsonl(args.jsonl, excel_path=args.excel, parquet_path=args.parquet)
+
+def build_merge_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="merge",
+        description="Combine the outputs of sharded runs, keeping one result per file hash (newest extractor version wins).",
+    )
+    ap.add_argument("inputs", nargs="+", help="SQLite databases, .jsonl streams and/or .parquet files to merge.")
+    ap.add_argument("--database", type=str, default=None, help="Merged SQLite DB path.")
+    ap.add_argument("--jsonl", type=str, default=None, help="Merged JSONL path.")
+    ap.add_argument("--excel", type=str, default=None, help="Merged Excel path (only if --database is not given).")
+    ap.add_argument("--parquet", type=str, default=None, help="Merged Parquet path (requires pyarrow).")
+    return ap
+
+def cmd_merge(args: argparse.Namespace):
+    setup_logging()
+    if not (args.database or args.jsonl or args.excel or args.parquet):
+        raise SystemExit("merge: give at least one of --database, --jsonl, --excel, --parquet")
+    from extract.pipeline.merge import merge_outputs
+    counts = merge_outputs(
+        args.inputs, sqlite_db_path=args.database, jsonl_path=args.jsonl,
+        excel_path=args.excel, parquet_path=args.parquet,
+    )
+    print(f"Merged {len(args.inputs)} inputs: {counts['written']} papers written, {counts['duplicates']} duplicates dropped")
+
+def cmd_run(args: argparse.Namespace):
+    from extract.pipeline.runner import run_pipeline
+    if not (args.pdf_dir or args.manifest):
+        raise SystemExit("give --pdf_dir or --manifest")
+    shard = None
+    if args.shard:
+        from extract.io.discovery import parse_shard
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            raise SystemExit(f"--shard: {e}")
+    setup_logging(args.log_level, args.log_format, debug_dumps=args.debug_dumps)
+    excel_path = args.excel
+    if excel_path is None and not (args.parquet or args.jsonl):
+        excel_path = "results.xlsx"
     run_pipeline(
         pdf_dir=args.pdf_dir,
         use_llm=args.llm,
         llm_model=args.llm_model,
         sqlite_db_path=args.database,
-        excel_path=args.excel,
+        excel_path=excel_path,
         max_pages=args.max_pages,
+        resume=args.resume,
+        parquet_path=args.parquet,
+        jsonl_path=args.jsonl,
+        prefetch=args.prefetch,
+        timings_path=args.timings,
+        profile_slowest=args.profile,
+        profile_dir=args.profile_dir,
+        regex_stats=args.regex_stats,
+        recursive=args.recursive,
+        include=args.include,
+        exclude=args.exclude,
+        symlinks=args.symlinks,
+        max_file_size=int(args.max_file_mb * 1024 * 1024) if args.max_file_mb else None,
+        manifest_path=args.manifest,
+        archives=args.archives,
+        shard=shard,
+        stages=args.stages,
+        fields=args.fields,
+        recompute=args.recompute,
+        triage_threshold=args.triage_threshold if args.triage else None,
+        triage_keep_path=args.triage_keep,
+        dedup_threshold=args.dedup_threshold if args.dedup else None,
     )
+
+def build_watch_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="watch",
+        description="Keep one process running and extract new or changed PDFs in a folder into SQLite as they arrive.",
+    )
+    ap.add_argument("--pdf_dir", type=str, required=True, help="Directory to watch.")
+    ap.add_argument("--database", type=str, required=True, help="SQLite DB path.")
+    ap.add_argument("--jsonl", type=str, default=None, help="Also append each result to this JSONL stream.")
+    ap.add_argument("--llm", action="store_true", help="Enable hybrid extraction (rules -> LLM refine)")
+    ap.add_argument("--llm_model", type=str, default="stub-model", help="LLM model name (used if --llm)")
+    ap.add_argument("--max_pages", type=int, default=3, help="Most front pages scanned for metadata; scanning stops early once DOI, year, keywords and article type are found.")
+    ap.add_argument("--interval", type=float, default=5.0, help="Seconds between directory scans.")
+    ap.add_argument("--settle", type=float, default=2.0, help="Seconds a file must stay unchanged before it is read.")
+    ap.add_argument("--status_file", type=str, default=None, help="Write queued/done/skipped/failed counters to this JSON file.")
+    ap.add_argument("--once", action="store_true", help="Process the PDFs already in the folder, then exit.")
+    ap.add_argument("--log_level", type=str, default="INFO", help="DEBUG, INFO, WARNING or ERROR.")
+    ap.add_argument("--log_format", choices=["text", "json"], default="text", help="Log line format (json for log collectors).")
+    return ap
+
+def cmd_watch(args: argparse.Namespace):
+    from extract.pipeline.watch import watch_directory
+    setup_logging(args.log_level, args.log_format)
+    watch_directory(
+        pdf_dir=args.pdf_dir,
+        sqlite_db_path=args.database,
+        use_llm=args.llm,
+        llm_model=args.llm_model,
+        max_pages=args.max_pages,
+        jsonl_path=args.jsonl,
+        interval=args.interval,
+        settle=args.settle,
+        status_path=args.status_file,
+        once=args.once,
+    )
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="serve",
+        description="Local HTTP extraction service: POST PDF bytes to /extract, read /metrics.",
+    )
+    ap.add_argument("--host", type=str, default="127.0.0.1", help="Bind address (keep it local).")
+    ap.add_argument("--port", type=int, default=8765, help="Port.")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    ap.add_argument("--queue", type=int, default=32, help="PDFs that may wait for a worker before requests get 429.")
+    ap.add_argument("--llm", action="store_true", help="Enable hybrid extraction (rules -> LLM refine)")
+    ap.add_argument("--llm_model", type=str, default="stub-model", help="LLM model name (used if --llm)")
+    ap.add_argument("--max_pages", type=int, default=3, help="Default max pages for metadata (per request: ?max_pages=N).")
+    ap.add_argument("--log_level", type=str, default="INFO", help="DEBUG, INFO, WARNING or ERROR.")
+    ap.add_argument("--log_format", choices=["text", "json"], default="text", help="Log line format (json for log collectors).")
+    return ap
+
+def cmd_serve(args: argparse.Namespace):
+    from extract.server import serve
+    setup_logging(args.log_level, args.log_format)
+    serve(
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        queue_size=args.queue,
+        use_llm=args.llm,
+        llm_model=args.llm_model,
+        max_pages=args.max_pages,
+    )
+
+# Subcommands are selected by the first argument; anything else is a
+# regular extraction run so `run.py --pdf_dir ...` keeps working.
+COMMANDS = {
+    "compact": (build_compact_parser, cmd_compact),
+    "search": (build_search_parser, cmd_search),
+    "export": (build_export_parser, cmd_export),
+    "merge": (build_merge_parser, cmd_merge),
+    "watch": (build_watch_parser, cmd_watch),
+    "serve": (build_serve_parser, cmd_serve),
+}
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        build, handler = COMMANDS[argv[0]]
+        handler(build().parse_args(argv[1:]))
+        return
+    cmd_run(build_parser().parse_args(argv))
@@ -12,13 +12,22 @@ CREATE TABLE IF NOT EXISTS papers (
   mesh_keywords TEXT,          
 
   extraction_method TEXT,
-  created_at TEXT DEFAULT (datetime('now'))
+  extractor_version INTEGER,   -- extract.extractors.EXTRACTOR_VERSION that produced the row
+  metadata_sources TEXT,       -- JSON {field: xmp|info|layout|text|llm}
+  relevance_score INTEGER,     -- nanomaterial vocabulary hits in the front matter (--triage)
+  triage TEXT,                 -- relevant | kept | metadata_only
+  version_kind TEXT,           -- preprint | accepted | publisher | unknown (--dedup)
+  duplicate_of TEXT,           -- file_hash of the canonical paper this file duplicates
+  record_hash TEXT,            -- sha256 of the extracted result, used to skip unchanged reruns
+  created_at TEXT DEFAULT (datetime('now')),
+  updated_at TEXT DEFAULT (datetime('now'))
 );
 
 
 CREATE TABLE IF NOT EXISTS nanomaterials (
   id INTEGER PRIMARY KEY AUTOINCREMENT,
   paper_id INTEGER NOT NULL,
+  nanoparticle_name TEXT,
   core_composition TEXT,
   nm_category TEXT,
   physical_phase TEXT,
@@ -26,5 +35,185 @@ CREATE TABLE IF NOT EXISTS nanomaterials (
   cas_number TEXT,
   catalog_or_batch TEXT,
   evidence TEXT,
+  particle_size TEXT,
+  zeta_potential TEXT,
+  morphology TEXT,
+  pdi TEXT,
+  crystal_phase TEXT,
+  purity_percent TEXT,
+  impurities TEXT,
+  supplier_manufacturer TEXT,
+  address TEXT,
+  supplier_code TEXT,
+  batch_or_lot_no TEXT,
+  nominal_diameter_nm TEXT,
+  nominal_length_micron TEXT,
+  nominal_specific_surface_area_m2_g TEXT,
+  dispersant TEXT,
+  tem_diameter_nm TEXT,
+  tem_width_nm_median TEXT,
+  tem_length_nm_median TEXT,
+  no_of_walls TEXT,
+  bet_surface_area_m2_g TEXT,
+  dls_mean_diameter_water_nm TEXT,
+  pdi_water TEXT,
+  dls_mean_diameter_medium_nm TEXT,
+  pdi_medium TEXT,
+  zeta_potential_water_mV TEXT,
+  zeta_potential_medium_mV TEXT,
+  description_of_dispersion TEXT,
+  endotoxins_EU_mg TEXT,
+
+  -- parsed numeric form of the characterization strings above
+  particle_size_value REAL,
+  particle_size_low REAL,
+  particle_size_high REAL,
+  particle_size_unit TEXT,
+  zeta_potential_value REAL,
+  zeta_potential_low REAL,
+  zeta_potential_high REAL,
+  zeta_potential_unit TEXT,
+  pdi_value REAL,
+  pdi_low REAL,
+  pdi_high REAL,
+  pdi_unit TEXT,
+  purity_percent_value REAL,
+  purity_percent_low REAL,
+  purity_percent_high REAL,
+  purity_percent_unit TEXT,
+  nominal_diameter_nm_value REAL,
+  nominal_diameter_nm_low REAL,
+  nominal_diameter_nm_high REAL,
+  nominal_diameter_nm_unit TEXT,
+  nominal_length_micron_value REAL,
+  nominal_length_micron_low REAL,
+  nominal_length_micron_high REAL,
+  nominal_length_micron_unit TEXT,
+  nominal_specific_surface_area_m2_g_value REAL,
+  nominal_specific_surface_area_m2_g_low REAL,
+  nominal_specific_surface_area_m2_g_high REAL,
+  nominal_specific_surface_area_m2_g_unit TEXT,
+  tem_diameter_nm_value REAL,
+  tem_diameter_nm_low REAL,
+  tem_diameter_nm_high REAL,
+  tem_diameter_nm_unit TEXT,
+  tem_width_nm_median_value REAL,
+  tem_width_nm_median_low REAL,
+  tem_width_nm_median_high REAL,
+  tem_width_nm_median_unit TEXT,
+  tem_length_nm_median_value REAL,
+  tem_length_nm_median_low REAL,
+  tem_length_nm_median_high REAL,
+  tem_length_nm_median_unit TEXT,
+  bet_surface_area_m2_g_value REAL,
+  bet_surface_area_m2_g_low REAL,
+  bet_surface_area_m2_g_high REAL,
+  bet_surface_area_m2_g_unit TEXT,
+  dls_mean_diameter_water_nm_value REAL,
+  dls_mean_diameter_water_nm_low REAL,
+  dls_mean_diameter_water_nm_high REAL,
+  dls_mean_diameter_water_nm_unit TEXT,
+  pdi_water_value REAL,
+  pdi_water_low REAL,
+  pdi_water_high REAL,
+  pdi_water_unit TEXT,
+  dls_mean_diameter_medium_nm_value REAL,
+  dls_mean_diameter_medium_nm_low REAL,
+  dls_mean_diameter_medium_nm_high REAL,
+  dls_mean_diameter_medium_nm_unit TEXT,
+  pdi_medium_value REAL,
+  pdi_medium_low REAL,
+  pdi_medium_high REAL,
+  pdi_medium_unit TEXT,
+  zeta_potential_water_mV_value REAL,
+  zeta_potential_water_mV_low REAL,
+  zeta_potential_water_mV_high REAL,
+  zeta_potential_water_mV_unit TEXT,
+  zeta_potential_medium_mV_value REAL,
+  zeta_potential_medium_mV_low REAL,
+  zeta_potential_medium_mV_high REAL,
+  zeta_potential_medium_mV_unit TEXT,
+  endotoxins_EU_mg_value REAL,
+  endotoxins_EU_mg_low REAL,
+  endotoxins_EU_mg_high REAL,
+  endotoxins_EU_mg_unit TEXT,
+  FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
+);
+
+-- one row per core composition, so "TiO2" is an index lookup rather than a LIKE scan
+CREATE TABLE IF NOT EXISTS nanomaterial_cores (
+  nanomaterial_id INTEGER NOT NULL,
+  core TEXT NOT NULL,
+  FOREIGN KEY (nanomaterial_id) REFERENCES nanomaterials(id) ON DELETE CASCADE
+);
+
+
+CREATE TABLE IF NOT EXISTS bio_effects (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  paper_id INTEGER NOT NULL,
+  cell_viability TEXT,
+  cell_viability_value REAL,
+  cell_viability_unit TEXT,
+  ros TEXT,
+  bio_evidence TEXT,
+  FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
+);
+
+
+-- section-tagged page text; segments of one page concatenate back to the page text
+CREATE TABLE IF NOT EXISTS paper_pages (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  paper_id INTEGER NOT NULL,
+  page INTEGER NOT NULL,
+  section TEXT,
+  text TEXT,
+  FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS paper_pages_fts USING fts5(
+  section, text,
+  content = 'paper_pages', content_rowid = 'id',
+  tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS paper_pages_ai AFTER INSERT ON paper_pages BEGIN
+  INSERT INTO paper_pages_fts (rowid, section, text) VALUES (new.id, new.section, new.text);
+END;
+
+CREATE TRIGGER IF NOT EXISTS paper_pages_ad AFTER DELETE ON paper_pages BEGIN
+  INSERT INTO paper_pages_fts (paper_pages_fts, rowid, section, text) VALUES ('delete', old.id, old.section, old.text);
+END;
+
+
+-- output of each extraction stage, so reruns only recompute stages whose version changed
+CREATE TABLE IF NOT EXISTS stage_results (
+  paper_id INTEGER NOT NULL,
+  stage TEXT NOT NULL,         -- key of extract.extractors.STAGE_VERSIONS
+  version INTEGER NOT NULL,
+  params TEXT,                 -- JSON of the options the output depends on (max_pages, LLM model)
+  output TEXT,                 -- JSON; NULL for full_text, whose output is paper_pages
+  PRIMARY KEY (paper_id, stage),
   FOREIGN KEY (paper_id) REFERENCES papers(id) ON DELETE CASCADE
 );
+
+
+CREATE INDEX IF NOT EXISTS idx_papers_doi ON papers(doi);
+CREATE INDEX IF NOT EXISTS idx_papers_year ON papers(year);
+CREATE INDEX IF NOT EXISTS idx_papers_duplicate_of ON papers(duplicate_of);
+
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_paper_id ON nanomaterials(paper_id);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_nm_category ON nanomaterials(nm_category);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_particle_size ON nanomaterials(particle_size_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_zeta_potential ON nanomaterials(zeta_potential_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_tem_diameter ON nanomaterials(tem_diameter_nm_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_bet ON nanomaterials(bet_surface_area_m2_g_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_dls_water ON nanomaterials(dls_mean_diameter_water_nm_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_dls_medium ON nanomaterials(dls_mean_diameter_medium_nm_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_zeta_water ON nanomaterials(zeta_potential_water_mV_value);
+CREATE INDEX IF NOT EXISTS idx_nanomaterials_zeta_medium ON nanomaterials(zeta_potential_medium_mV_value);
+
+CREATE INDEX IF NOT EXISTS idx_nanomaterial_cores_core ON nanomaterial_cores(core, nanomaterial_id);
+CREATE INDEX IF NOT EXISTS idx_nanomaterial_cores_nm ON nanomaterial_cores(nanomaterial_id);
+CREATE INDEX IF NOT EXISTS idx_bio_effects_paper_id ON bio_effects(paper_id);
+CREATE INDEX IF NOT EXISTS idx_paper_pages_paper_id ON paper_pages(paper_id, page);
+CREATE INDEX IF NOT EXISTS idx_bio_effects_cell_viability ON bio_effects(cell_viability_value);
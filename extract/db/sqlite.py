@@ -1,31 +1,48 @@
+import json
 import sqlite3
 from pathlib import Path
+from typing import Iterator
 
-def init_sqlite(db_path: str) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON;")
+from extract.utils.hashing import sha256_record
+from extract.utils.units import QUANTITY_FIELDS, parse_quantity
+
+def _schema_sql() -> str:
+    return Path(__file__).with_name("schema.sql").read_text(encoding="utf-8")
 
-    schema_path = Path(__file__).with_name("schema.sql")
-    schema_sql = schema_path.read_text(encoding="utf-8")
+def _migrate(conn: sqlite3.Connection, schema_sql: str):
+    """
+    CREATE TABLE IF NOT EXISTS leaves older databases untouched, so add any
+    column that schema.sql declares but an existing table lacks.
+    """
+    ref = sqlite3.connect(":memory:")
+    ref.executescript(schema_sql)
+    tables = [r[0] for r in ref.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    for table in tables:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if not existing:
+            continue  # new table, created by the schema script
+        for _, name, decl, _, default, _ in ref.execute(f"PRAGMA table_info({table})"):
+            if name in existing:
+                continue
+            # ALTER TABLE only accepts constant defaults
+            if default is not None and "(" not in default:
+                decl = f"{decl} DEFAULT {default}"
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+    ref.close()
+
+def init_sqlite(db_path: str, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA foreign_keys = ON;")
 
+    schema_sql = _schema_sql()
+    # Migrate first: the schema's indexes may reference the new columns.
+    _migrate(conn, schema_sql)
     conn.executescript(schema_sql)
     conn.commit()
     return conn
 
-def upsert_paper_and_insert_nanomat(conn: sqlite3.Connection, result: dict):
-    p = result["paper"]
-    n = result["nanomaterial"]
-
-    cur = conn.cursor()
-
-    cur.execute("""
-        INSERT OR IGNORE INTO papers (
-        file_path, file_hash, title, year, doi, source_url,
-        article_type, author_keywords, mesh_keywords,
-        extraction_method
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+def _paper_values(p: dict) -> tuple:
+    return (
         p.get("file_path"),
         p.get("file_hash"),
         p.get("title"),
@@ -36,25 +53,328 @@ def upsert_paper_and_insert_nanomat(conn: sqlite3.Connection, result: dict):
         p.get("author_keywords"),
         p.get("mesh_keywords"),
         p.get("extraction_method"),
-    ))
+        p.get("extractor_version"),
+        json.dumps(p["metadata_sources"]) if p.get("metadata_sources") is not None else None,
+        p.get("relevance_score"),
+        p.get("triage"),
+        p.get("version_kind"),
+        p.get("duplicate_of"),
+    )
 
-    conn.commit()
+_NANO_TEXT_COLUMNS = [
+    "nanoparticle_name", "nm_category", "physical_phase", "crystallinity",
+    "cas_number", "catalog_or_batch", "evidence",
+    "particle_size", "zeta_potential", "morphology", "pdi",
+    "crystal_phase", "purity_percent", "impurities", "supplier_manufacturer",
+    "address", "supplier_code", "batch_or_lot_no",
+    "nominal_diameter_nm", "nominal_length_micron", "nominal_specific_surface_area_m2_g",
+    "dispersant", "tem_diameter_nm", "tem_width_nm_median", "tem_length_nm_median",
+    "no_of_walls", "bet_surface_area_m2_g",
+    "dls_mean_diameter_water_nm", "pdi_water", "dls_mean_diameter_medium_nm", "pdi_medium",
+    "zeta_potential_water_mV", "zeta_potential_medium_mV",
+    "description_of_dispersion", "endotoxins_EU_mg",
+]
+
+_NANO_QUANTITY_COLUMNS = [
+    f"{field}_{part}"
+    for field in QUANTITY_FIELDS
+    for part in ("value", "low", "high", "unit")
+]
+
+_NANO_COLUMNS = ["paper_id", "core_composition"] + _NANO_TEXT_COLUMNS + _NANO_QUANTITY_COLUMNS
+
+_INSERT_NANO_SQL = (
+    f"INSERT INTO nanomaterials ({', '.join(_NANO_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _NANO_COLUMNS)})"
+)
 
-    cur.execute("SELECT id FROM papers WHERE file_hash = ?", (p.get("file_hash"),))
-    paper_id = cur.fetchone()[0]
+def _text(v):
+    # LLM patches may put numbers (or lists) where rules put strings
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, list):
+        return "; ".join(str(x) for x in v)
+    return str(v)
 
+def _insert_nanomat(cur: sqlite3.Cursor, paper_id: int, n: dict):
+    cores = n.get("core_compositions") or []
+    values = [paper_id, "; ".join(cores)]
+    values += [_text(n.get(c)) for c in _NANO_TEXT_COLUMNS]
+    for field, default_unit in QUANTITY_FIELDS.items():
+        q = parse_quantity(_text(n.get(field)), default_unit)
+        values += [q["value"], q["low"], q["high"], q["unit"]]
+
+    cur.execute(_INSERT_NANO_SQL, values)
+    nano_id = cur.lastrowid
+    cur.executemany(
+        "INSERT INTO nanomaterial_cores (nanomaterial_id, core) VALUES (?, ?)",
+        [(nano_id, c) for c in dict.fromkeys(cores)],
+    )
+
+def _insert_bio_effects(cur: sqlite3.Cursor, paper_id: int, b: dict):
+    viab = parse_quantity(b.get("cell_viability"))
     cur.execute("""
-        INSERT INTO nanomaterials
-          (paper_id, core_composition, nm_category, physical_phase, crystallinity, cas_number, catalog_or_batch, evidence)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT INTO bio_effects
+          (paper_id, cell_viability, cell_viability_value, cell_viability_unit, ros, bio_evidence)
+        VALUES (?, ?, ?, ?, ?, ?)
     """, (
         paper_id,
-        "; ".join(n.get("core_compositions") or []),
-        n.get("nm_category"),
-        n.get("physical_phase"),
-        n.get("crystallinity"),
-        n.get("cas_number"),
-        n.get("catalog_or_batch"),
-        n.get("evidence"),
+        b.get("cell_viability"),
+        viab["value"],
+        viab["unit"],
+        b.get("ros"),
+        b.get("bio_evidence"),
     ))
-    conn.commit()
+
+def upsert_paper_and_nanomat(conn: sqlite3.Connection, result: dict) -> str:
+    """
+    Idempotent write of one pipeline result, keyed by file hash.
+
+    Returns "inserted", "updated" or "unchanged". An unchanged record (same
+    content hash as stored) is skipped; a changed one replaces the paper's
+    row and its nanomaterial and bio effects rows in a single transaction.
+    """
+    p = result["paper"]
+    n = result["nanomaterial"]
+    b = result.get("bio_effects") or {}
+    record_hash = sha256_record(result)
+
+    cur = conn.cursor()
+    cur.execute("SELECT id, record_hash FROM papers WHERE file_hash = ?", (p.get("file_hash"),))
+    row = cur.fetchone()
+    if row and row[1] == record_hash:
+        return "unchanged"
+
+    with conn:
+        # A different file now living at the same path replaces the old record.
+        cur.execute(
+            "DELETE FROM papers WHERE file_path = ? AND file_hash != ?",
+            (p.get("file_path"), p.get("file_hash")),
+        )
+
+        if row:
+            paper_id = row[0]
+            cur.execute("""
+                UPDATE papers SET
+                  file_path = ?, file_hash = ?, title = ?, year = ?, doi = ?, source_url = ?,
+                  article_type = ?, author_keywords = ?, mesh_keywords = ?,
+                  extraction_method = ?, extractor_version = ?, metadata_sources = ?,
+                  relevance_score = ?, triage = ?, version_kind = ?, duplicate_of = ?,
+                  record_hash = ?, updated_at = datetime('now')
+                WHERE id = ?
+            """, _paper_values(p) + (record_hash, paper_id))
+            cur.execute("DELETE FROM nanomaterials WHERE paper_id = ?", (paper_id,))
+            cur.execute("DELETE FROM bio_effects WHERE paper_id = ?", (paper_id,))
+            status = "updated"
+        else:
+            cur.execute("""
+                INSERT INTO papers (
+                file_path, file_hash, title, year, doi, source_url,
+                article_type, author_keywords, mesh_keywords,
+                extraction_method, extractor_version, metadata_sources, relevance_score, triage,
+                version_kind, duplicate_of, record_hash, updated_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+            """, _paper_values(p) + (record_hash,))
+            paper_id = cur.lastrowid
+            status = "inserted"
+
+        _insert_nanomat(cur, paper_id, n)
+        _insert_bio_effects(cur, paper_id, b)
+
+    return status
+
+def existing_file_hashes(conn: sqlite3.Connection) -> set:
+    return {r[0] for r in conn.execute("SELECT file_hash FROM papers")}
+
+_PAPER_COLUMNS = [
+    "file_path", "file_hash", "title", "year", "doi", "source_url",
+    "article_type", "author_keywords", "mesh_keywords", "extraction_method", "extractor_version",
+    "metadata_sources", "relevance_score", "triage", "version_kind", "duplicate_of",
+]
+
+def iter_results(conn: sqlite3.Connection, pages: bool = True, batch: int = 500) -> Iterator[tuple[dict, list[dict]]]:
+    """
+    Yields ({paper, nanomaterial, bio_effects}, pages) for every stored paper,
+    rebuilt from the tables (pages as in load_paper_pages, empty if `pages`
+    is False). Used to merge databases; parsed numeric columns are
+    recomputed on insert. Papers are read `batch` rows at a time, so a
+    large database is streamed.
+    """
+    last_id = 0
+    while True:
+        # keyset paging: no read cursor stays open while the caller writes elsewhere
+        rows = conn.execute(
+            f"SELECT id, {', '.join(_PAPER_COLUMNS)} FROM papers WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch),
+        ).fetchall()
+        if not rows:
+            return
+        for paper_id, *values in rows:
+            result = _read_result(conn, paper_id, values)
+            yield result, load_paper_pages(conn, result["paper"]["file_hash"]) if pages else []
+        last_id = rows[-1][0]
+
+def load_result(conn: sqlite3.Connection, file_hash: str) -> dict | None:
+    """
+    The stored {paper, nanomaterial, bio_effects} result of one file, or None.
+    """
+    row = conn.execute(
+        f"SELECT id, {', '.join(_PAPER_COLUMNS)} FROM papers WHERE file_hash = ?", (file_hash,)
+    ).fetchone()
+    return _read_result(conn, row[0], row[1:]) if row else None
+
+def _read_result(conn: sqlite3.Connection, paper_id: int, paper_values) -> dict:
+    paper = {k: v for k, v in zip(_PAPER_COLUMNS, paper_values) if v is not None}
+    if "metadata_sources" in paper:
+        paper["metadata_sources"] = json.loads(paper["metadata_sources"])
+
+    nano = {}
+    row = conn.execute(
+        f"SELECT core_composition, {', '.join(_NANO_TEXT_COLUMNS)} FROM nanomaterials "
+        "WHERE paper_id = ? ORDER BY id DESC LIMIT 1", (paper_id,),
+    ).fetchone()
+    if row:
+        nano = dict(zip(_NANO_TEXT_COLUMNS, row[1:]))
+        nano["core_compositions"] = [c for c in (row[0] or "").split("; ") if c]
+
+    bio = {}
+    row = conn.execute(
+        "SELECT cell_viability, ros, bio_evidence FROM bio_effects "
+        "WHERE paper_id = ? ORDER BY id DESC LIMIT 1", (paper_id,),
+    ).fetchone()
+    if row:
+        bio = dict(zip(("cell_viability", "ros", "bio_evidence"), row))
+
+    return {"paper": paper, "nanomaterial": nano, "bio_effects": bio}
+
+def compact_sqlite(conn: sqlite3.Connection) -> int:
+    """
+    One-off cleanup for databases written before upserts were idempotent:
+    keeps only the newest nanomaterial / bio effects row per paper, then
+    VACUUMs. Returns the number of rows removed.
+    """
+    removed = 0
+    with conn:
+        for table in ("nanomaterials", "bio_effects"):
+            cur = conn.execute(f"""
+                DELETE FROM {table}
+                WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY paper_id)
+            """)
+            removed += cur.rowcount
+    conn.execute("VACUUM")
+    return removed
+
+def store_paper_text(conn: sqlite3.Connection, file_hash: str, sections: list[dict], replace: bool = False) -> bool:
+    """
+    Store section-tagged page text ({page, section, text}) for the full-text
+    index. Text is a function of the file hash, so a paper that already has
+    text is left alone unless `replace` is set (the text extraction itself
+    changed). Returns True if rows were written.
+    """
+    row = conn.execute("SELECT id FROM papers WHERE file_hash = ?", (file_hash,)).fetchone()
+    if not row:
+        return False
+    paper_id = row[0]
+    has_text = conn.execute("SELECT 1 FROM paper_pages WHERE paper_id = ? LIMIT 1", (paper_id,)).fetchone()
+    if has_text and not (replace and sections):
+        return False
+
+    with conn:
+        if has_text:
+            conn.execute("DELETE FROM paper_pages WHERE paper_id = ?", (paper_id,))
+        conn.executemany(
+            "INSERT INTO paper_pages (paper_id, page, section, text) VALUES (?, ?, ?, ?)",
+            [(paper_id, s["page"], s["section"], s["text"]) for s in sections],
+        )
+    return True
+
+def load_paper_pages(conn: sqlite3.Connection, file_hash: str) -> list[dict]:
+    """
+    Rebuild [{page, text}] for a paper from stored text, so extractors can
+    be re-run without opening the PDF. Empty list if nothing is stored.
+    """
+    rows = conn.execute("""
+        SELECT pp.page, pp.text
+        FROM paper_pages pp JOIN papers p ON p.id = pp.paper_id
+        WHERE p.file_hash = ?
+        ORDER BY pp.page, pp.id
+    """, (file_hash,)).fetchall()
+
+    pages: dict[int, list[str]] = {}
+    for page, text in rows:
+        pages.setdefault(page, []).append(text or "")
+    return [{"page": page, "text": "".join(parts)} for page, parts in pages.items()]
+
+def relink_duplicates(conn: sqlite3.Connection, old_hash: str, new_hash: str) -> int:
+    """
+    Makes `new_hash` the canonical paper of `old_hash` and of every paper
+    linked to it. Returns the number of rows relinked.
+    """
+    with conn:
+        cur = conn.execute(
+            "UPDATE papers SET duplicate_of = ? WHERE (file_hash = ? OR duplicate_of = ?) AND file_hash != ?",
+            (new_hash, old_hash, old_hash, new_hash),
+        )
+    return cur.rowcount
+
+def load_stage_results(conn: sqlite3.Connection, file_hash: str) -> dict[str, tuple]:
+    """
+    {stage: (version, params, output)} stored for one file (see
+    extract.pipeline.plan.StageCache); empty if the file is not stored.
+    """
+    rows = conn.execute("""
+        SELECT s.stage, s.version, s.params, s.output
+        FROM stage_results s JOIN papers p ON p.id = s.paper_id
+        WHERE p.file_hash = ?
+    """, (file_hash,)).fetchall()
+    return {
+        stage: (version, json.loads(params) if params else None, json.loads(output) if output else None)
+        for stage, version, params, output in rows
+    }
+
+def store_stage_results(conn: sqlite3.Connection, file_hash: str, outputs: dict[str, tuple]) -> int:
+    """
+    Replace the stored {stage: (version, params, output)} entries of a
+    stored paper. Returns the number of stages written.
+    """
+    row = conn.execute("SELECT id FROM papers WHERE file_hash = ?", (file_hash,)).fetchone()
+    if not row or not outputs:
+        return 0
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO stage_results (paper_id, stage, version, params, output) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    row[0], stage, version,
+                    json.dumps(params, sort_keys=True) if params else None,
+                    json.dumps(output, ensure_ascii=False, default=str) if output is not None else None,
+                )
+                for stage, (version, params, output) in outputs.items()
+            ],
+        )
+    return len(outputs)
+
+def search_text(conn: sqlite3.Connection, query: str, limit: int = 20, section: str | None = None) -> list[dict]:
+    """
+    FTS5 query over stored paper text, best matches first.
+    """
+    sql = """
+        SELECT p.file_path, p.doi, pp.page, pp.section,
+               snippet(paper_pages_fts, 1, '[', ']', ' ... ', 16)
+        FROM paper_pages_fts
+        JOIN paper_pages pp ON pp.id = paper_pages_fts.rowid
+        JOIN papers p ON p.id = pp.paper_id
+        WHERE paper_pages_fts MATCH ?
+    """
+    params: list = [query]
+    if section:
+        sql += " AND pp.section = ?"
+        params.append(section)
+    sql += " ORDER BY bm25(paper_pages_fts) LIMIT ?"
+    params.append(limit)
+
+    return [
+        {"file_path": r[0], "doi": r[1], "page": r[2], "section": r[3], "snippet": r[4]}
+        for r in conn.execute(sql, params)
+    ]
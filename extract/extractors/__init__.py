@@ -0,0 +1,21 @@
+# Version of each extraction stage (see extract.pipeline.plan). Bump a
+# stage's number when a change to its code alters its output: with --database,
+# reruns reuse the stored output of every stage whose version is unchanged and
+# recompute only the bumped stages and the stages that read their output.
+STAGE_VERSIONS = {
+    "embedded": 4,          # embedded_metadata.py
+    "layout_title": 3,      # metadata.extract_title_from_first_page_layout
+    "metadata": 2,          # metadata.py text scans
+    "triage": 1,            # triage.py relevance score
+    "dedup": 1,             # pipeline/dedup.py version kind + utils/minhash.py signature
+    "full_text": 1,         # io/pdf_reader.py page text
+    "table_rows": 1,        # table_extractor.py
+    "nanomaterial": 1,      # nanomaterial.py identity fields
+    "characterization": 1,  # characterization_regex.py + table_parser.py
+    "bio_effects": 1,       # bio_effects.py
+    "llm": 2,               # llm/ollama_client.py prompt and patch handling
+}
+
+# Stamped on every result as paper.extractor_version. It rises whenever any
+# stage version is bumped, so `merge` can prefer newer results.
+EXTRACTOR_VERSION = sum(STAGE_VERSIONS.values())
@@ -1,5 +1,7 @@
 import re
-from typing import Dict, Optional
+
+from extract.utils.patterns import register_patterns
+from extract.records import BioEffectsRecord
 
 # Very conservative regexes (prototype)
 CELL_VIAB_RE = re.compile(
@@ -12,12 +14,8 @@ ROS_RE = re.compile(
     re.I
 )
 
-def extract_bio_effects(text: str) -> Dict[str, Optional[str]]:
-    out = {
-        "cell_viability": None,
-        "ros": None,
-        "bio_evidence": None,
-    }
+def extract_bio_effects(text: str) -> BioEffectsRecord:
+    out = BioEffectsRecord()
 
     m = CELL_VIAB_RE.search(text)
     if m:
@@ -33,3 +31,5 @@ def extract_bio_effects(text: str) -> Dict[str, Optional[str]]:
         out["ros"] = "mentioned"
 
     return out
+
+register_patterns(__name__)
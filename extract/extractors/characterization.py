@@ -1,6 +1,8 @@
 import re
 from typing import Dict, Optional
 
+from extract.utils.patterns import register_patterns
+
 DASH = r"[-–—]"
 
 BET_RE = re.compile(r"(?:BET\s*(?:surface\s*area)?|surface\s*area)\s*(?:=|:|of)?\s*([0-9]+(?:\.[0-9]+)?)\s*(m2/g|m²/g)", re.I)
@@ -58,3 +60,5 @@ def extract_characterization_fields(text: str) -> Dict[str, Optional[str]]:
         out["pdi_water"] = pdi
 
     return out
+
+register_patterns(__name__)
@@ -1,6 +1,8 @@
 import re
 from typing import Dict, Optional
 
+from extract.utils.patterns import register_patterns
+
 DASH = r"[-–—]"
 NUM = r"[0-9]+(?:\.[0-9]+)?"
 RANGE = rf"{NUM}(?:\s*{DASH}\s*{NUM})?"
@@ -109,3 +111,5 @@ def extract_characterization_regex(text: str) -> Dict[str, Optional[str]]:
 
     # Drop None values (keeps your defaults intact)
     return {k: v for k, v in out.items() if v}
+
+register_patterns(__name__)
@@ -0,0 +1,160 @@
+import datetime
+import re
+from typing import Optional
+
+from extract.extractors.metadata import (
+    BAD_TITLE_EXACT, DOI_RE, SOURCE_INFO, SOURCE_XMP, _clean, _split_keywords,
+)
+from extract.utils.patterns import register_patterns
+
+# Metadata the publisher embedded in the PDF: the document info dictionary
+# (doc.metadata) and the XMP packet. Reading it needs no page text, and the
+# fields it provides are not scanned for in the page text.
+#
+# Every value is validated before use; embedded fields are often stale
+# (templates), generic ("Microsoft Word - draft.docx") or producer dates.
+
+# element body in the XMP packet; rdf:Alt / rdf:Bag / rdf:Seq items are read from rdf:li
+_XMP_TAG = r"<{tag}\b[^>]*>(.*?)</{tag}>"
+_XMP_LI_RE = re.compile(r"<rdf:li\b[^>]*>(.*?)</rdf:li>", re.S)
+_XMP_ATTR = r'\b{tag}="([^"]*)"'
+
+_XMP_TAGS = {
+    tag: (re.compile(_XMP_TAG.format(tag=re.escape(tag)), re.S), re.compile(_XMP_ATTR.format(tag=re.escape(tag))))
+    for tag in (
+        "prism:doi", "dc:identifier", "prism:url", "dc:title",
+        "prism:publicationDate", "prism:coverDate", "prism:coverDisplayDate", "xmp:CreateDate",
+        "pdf:Keywords", "dc:subject",
+    )
+}
+
+YEAR_IN_DATE_RE = re.compile(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)")
+
+# Info titles that are file names or word-processor leftovers, not paper titles
+GENERIC_TITLE_RE = re.compile(r"(^microsoft (word|powerpoint)\b|\.(docx?|pdf|tex|indd|rtf)$|^untitled\b)", re.I)
+
+# Publisher and boilerplate text in an embedded title
+EMBEDDED_BAD_TITLE_CONTAINS = [
+    "elsevier", "springer", "wiley", "copyright", "all rights reserved",
+    "available online", "doi:", "pii:", "crossmark",
+]
+
+# Journal names (the info title of some publishers), not paper titles
+JOURNAL_TITLE_RE = re.compile(
+    r"^(the\s+)?(international\s+)?(journal|annals|archives|proceedings|transactions)\s+(of|in|on)\b"
+    r"|\b(letters|reports|communications)$",
+    re.I,
+)
+
+_ENTITIES = {"&amp;": "&", "&lt;": "<", "&gt;": ">", "&quot;": '"', "&apos;": "'"}
+
+
+def _unescape(s: str) -> str:
+    for k, v in _ENTITIES.items():
+        s = s.replace(k, v)
+    return s
+
+
+def _xmp_values(xmp: str, tag: str) -> list[str]:
+    # Text values of `tag`, as an element or an attribute (both forms are valid XMP)
+    element_re, attr_re = _XMP_TAGS[tag]
+    values = []
+    for body in element_re.findall(xmp):
+        items = _XMP_LI_RE.findall(body)
+        values += items if items else [body]
+    values += attr_re.findall(xmp)
+    return [v for v in (_clean(_unescape(x)) for x in values) if v]
+
+
+def valid_doi(value: str | None) -> Optional[str]:
+    # accepts "10.x/y", "doi:10.x/y" and doi.org URLs
+    m = DOI_RE.search(value or "")
+    return m.group(0).rstrip(".") if m else None
+
+
+def valid_year(value: str | None) -> Optional[int]:
+    m = YEAR_IN_DATE_RE.search(value or "")
+    if not m:
+        return None
+    year = int(m.group(1))
+    return year if 1900 <= year <= datetime.date.today().year + 1 else None
+
+
+def valid_title(value: str | None) -> Optional[str]:
+    title = _clean(value or "")
+    low = title.lower()
+    if not 12 <= len(title) <= 300 or GENERIC_TITLE_RE.search(title) or JOURNAL_TITLE_RE.search(title):
+        return None
+    if low in BAD_TITLE_EXACT or any(b in low for b in EMBEDDED_BAD_TITLE_CONTAINS):
+        return None
+    return title
+
+
+def valid_url(value: str | None) -> Optional[str]:
+    value = (value or "").strip()
+    return value if value.lower().startswith(("http://", "https://")) and " " not in value else None
+
+
+def _read_xmp(doc) -> str:
+    try:
+        return doc.get_xml_metadata() or ""
+    except Exception:
+        return ""  # damaged metadata stream: fall back to the text scans
+
+
+def read_created_year(doc) -> Optional[int]:
+    """
+    Year of the XMP xmp:CreateDate, i.e. when the file was made. Not a
+    publication year: only a fallback for papers whose text gives none.
+    """
+    for v in _xmp_values(_read_xmp(doc), "xmp:CreateDate"):
+        year = valid_year(v)
+        if year is not None:
+            return year
+    return None
+
+
+def read_embedded_metadata(doc) -> tuple[dict, dict]:
+    """
+    Validated title / doi / year / source_url / author_keywords from an open
+    fitz document's XMP packet and info dictionary, without reading page
+    text. Returns (values, sources): only fields that passed validation are
+    present, and sources maps each to SOURCE_XMP or SOURCE_INFO. XMP wins
+    over the info dictionary.
+    """
+    info = doc.metadata or {}
+    xmp = _read_xmp(doc)
+
+    # field -> [(source, candidate)] in order of preference
+    candidates = {
+        "doi": [(SOURCE_XMP, v) for v in _xmp_values(xmp, "prism:doi") + _xmp_values(xmp, "dc:identifier")]
+        + [(SOURCE_INFO, info.get("subject")), (SOURCE_INFO, info.get("keywords"))],
+        "title": [(SOURCE_XMP, v) for v in _xmp_values(xmp, "dc:title")] + [(SOURCE_INFO, info.get("title"))],
+        "year": [(SOURCE_XMP, v) for tag in ("prism:publicationDate", "prism:coverDate", "prism:coverDisplayDate")
+                 for v in _xmp_values(xmp, tag)],
+        "source_url": [(SOURCE_XMP, v) for v in _xmp_values(xmp, "prism:url")],
+        "author_keywords": [(SOURCE_XMP, "; ".join(_xmp_values(xmp, "dc:subject")) or None)]
+        + [(SOURCE_XMP, v) for v in _xmp_values(xmp, "pdf:Keywords")]
+        + [(SOURCE_INFO, info.get("keywords"))],
+    }
+    validators = {
+        "doi": valid_doi,
+        "title": valid_title,
+        "year": valid_year,
+        "source_url": valid_url,
+        # a DOI in the keywords entry is not a keyword list
+        "author_keywords": lambda v: "; ".join(_split_keywords(v)) or None if v and not valid_doi(v) else None,
+    }
+
+    values, sources = {}, {}
+    for field, options in candidates.items():
+        for source, raw in options:
+            value = validators[field](raw)
+            if value is not None:
+                values[field] = value
+                sources[field] = source
+                break
+    return values, sources
+
+
+register_patterns(__name__)
@@ -1,5 +1,8 @@
 import re
-from typing import Optional
+from typing import Iterable, Optional
+
+from extract.utils.patterns import register_patterns
+from extract.records import PaperRecord
 
 DOI_RE = re.compile(r"\b10\.\d{4,9}/[-._;()/:A-Z0-9]+\b", re.I)
 YEAR_RE = re.compile(r"\b(19\d{2}|20\d{2})\b")
@@ -28,15 +31,13 @@ MESH_BLOCK_RE = re.compile(
     re.I | re.S
 )
 
-BAD_TITLE_EXACT = {
-    "review article", "research article", "original article",
-    "short communication", "editorial", "erratum"
-}
-
-BAD_TITLE_CONTAINS = [
-    "elsevier", "springer", "wiley", "copyright", "all rights reserved",
-    "received", "accepted", "available online", "doi:", "journal"
-]
+# Where a paper field came from, recorded in paper.metadata_sources
+SOURCE_XMP = "xmp"        # XMP packet
+SOURCE_INFO = "info"      # PDF info dictionary
+SOURCE_LAYOUT = "layout"  # largest text on the first page
+SOURCE_TEXT = "text"      # regex scan of the first pages' text
+SOURCE_XMP_CREATED = "xmp_created"  # XMP file creation date, a year fallback
+SOURCE_LLM = "llm"        # set by an LLM patch
 
 BAD_TITLE_EXACT = {
     "review article", "research article", "original article",
@@ -273,21 +274,100 @@ def infer_article_type(text: str) -> Optional[str]:
 
     return None
 
-def extract_paper_metadata(text: str, pages: list[dict], file_path: str, file_hash: str) -> dict:
-    author_kws = extract_author_keywords(text)
-    mesh_kws = extract_mesh_keywords(text)
-
-    return {
-        "file_path": file_path,
-        "file_hash": file_hash,
-        # "title": extract_title_from_first_page_layout(pages),
-        "year": extract_year(text),
-        "doi": extract_doi(text),
-        "source_url": extract_source_url(text),
-
-        "article_type": infer_article_type(text),
-        "author_keywords": "; ".join(author_kws) if author_kws else None,
-        "mesh_keywords": "; ".join(mesh_kws) if mesh_kws else None,
-
-        "extraction_method": None,  # pipeline sets this
-    }
+def _scan_author_keywords(text: str) -> Optional[str]:
+    kws = extract_author_keywords(text)
+    return "; ".join(kws) if kws else None
+
+def _scan_mesh_keywords(text: str) -> Optional[str]:
+    kws = extract_mesh_keywords(text)
+    return "; ".join(kws) if kws else None
+
+# paper field -> text scanner; a field is only scanned while it is still empty
+_TEXT_SCANNERS = {
+    "year": extract_year,
+    "doi": extract_doi,
+    "source_url": extract_source_url,
+    "article_type": infer_article_type,
+    "author_keywords": _scan_author_keywords,
+    "mesh_keywords": _scan_mesh_keywords,
+}
+# fields that can also come from embedded metadata, so their source is recorded
+_SOURCED_FIELDS = {"year", "doi", "source_url", "author_keywords"}
+
+# scan_paper_metadata reads no further pages once these are all found
+SETTLED_FIELDS = ("doi", "year", "author_keywords", "article_type")
+
+# PubMed / MEDLINE records list MeSH terms, often after the abstract on a later
+# page: once a page hints at one, mesh_keywords must be found too before stopping
+MESH_HINT_RE = re.compile(r"\b(mesh\s*(terms?|headings?)|medline|pubmed|pmid)\b", re.I)
+
+def _new_paper(file_path: str, file_hash: str, embedded: dict, sources: dict) -> PaperRecord:
+    paper = PaperRecord(
+        file_path=file_path,
+        file_hash=file_hash,
+        extraction_method=None,  # pipeline sets this
+        metadata_sources=sources,
+        **{f: None for f in _TEXT_SCANNERS},
+    )
+    paper.update(embedded)
+    return paper
+
+def _scan_text(paper: PaperRecord, text: str):
+    sources = paper["metadata_sources"]
+    for field, scan in _TEXT_SCANNERS.items():
+        if paper.get(field):
+            continue
+        value = scan(text)
+        if value:
+            paper[field] = value
+            if field in _SOURCED_FIELDS:
+                sources[field] = SOURCE_TEXT
+
+def extract_paper_metadata(
+    text: str,
+    file_path: str,
+    file_hash: str,
+    embedded: dict | None = None,
+    sources: dict | None = None,
+) -> PaperRecord:
+    """
+    Paper fields from the first pages' text. Fields already in `embedded`
+    (validated values from read_embedded_metadata, with their `sources`)
+    are taken as they are and not scanned for.
+    """
+    paper = _new_paper(file_path, file_hash, embedded or {}, dict(sources or {}))
+    _scan_text(paper, text)
+    return paper
+
+def scan_paper_metadata(
+    pages: Iterable[dict],
+    file_path: str,
+    file_hash: str,
+    embedded: dict | None = None,
+    sources: dict | None = None,
+    created_year: int | None = None,
+) -> tuple[PaperRecord, list[dict]]:
+    """
+    Page-by-page extract_paper_metadata: `pages` ({page, text}, usually a
+    lazy iter_page_texts) are consumed one at a time, each scanned only for
+    the fields still empty, until all SETTLED_FIELDS (and mesh_keywords,
+    once a page hints at MeSH terms) are found or the pages run out.
+    `created_year` (the file's creation date) is used only when
+    no year was found. Returns (paper, pages read).
+    """
+    paper = _new_paper(file_path, file_hash, embedded or {}, dict(sources or {}))
+    read = []
+    settled = SETTLED_FIELDS
+    for page in pages:
+        read.append(page)
+        _scan_text(paper, page["text"])
+        if MESH_HINT_RE.search(page["text"]):
+            settled = SETTLED_FIELDS + ("mesh_keywords",)
+        if all(paper.get(f) for f in settled):
+            break
+    if not paper.get("year") and created_year:
+        paper["year"] = created_year
+        paper["metadata_sources"]["year"] = SOURCE_XMP_CREATED
+    return paper, read
+
+register_patterns(__name__)
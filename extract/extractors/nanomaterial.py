@@ -3,52 +3,13 @@ from typing import Optional
 
 from extract.extractors.characterization import extract_characterization_fields
 from extract.extractors.characterization_regex import extract_characterization_regex
+from extract.utils.patterns import register_patterns
+from extract.records import NanomaterialRecord
 
 
 
-NANOMATERIAL_DEFAULTS = {
-    # identity (existing)
-    "nanoparticle_name": None,
-    "core_compositions": [],
-    "nm_category": None,
-    "physical_phase": None,
-    "crystallinity": None,
-    "cas_number": None,
-    "catalog_or_batch": None,
-    # "evidence": None,
-
-    # your new descriptors
-    "particle_size": None,
-    "zeta_potential": None,
-    "morphology": None,
-    "pdi": None,
-
-    # characterization-sheet fields
-    "crystal_phase": None,
-    "purity_percent": None,
-    "impurities": None,
-    "supplier_manufacturer": None,
-    "address": None,
-    "supplier_code": None,
-    "batch_or_lot_no": None,
-    "nominal_diameter_nm": None,
-    "nominal_length_micron": None,
-    "nominal_specific_surface_area_m2_g": None,
-    "dispersant": None,
-    "tem_diameter_nm": None,
-    "tem_width_nm_median": None,
-    "tem_length_nm_median": None,
-    "no_of_walls": None,
-    "bet_surface_area_m2_g": None,
-    "dls_mean_diameter_water_nm": None,
-    "pdi_water": None,
-    "dls_mean_diameter_medium_nm": None,
-    "pdi_medium": None,
-    "zeta_potential_water_mV": None,
-    "zeta_potential_medium_mV": None,
-    "description_of_dispersion": None,
-    "endotoxins_EU_mg": None,
-}
+# Plain-dict view of the record defaults (fields live in extract.records)
+NANOMATERIAL_DEFAULTS = NanomaterialRecord.defaults()
 
 
 DASH = r"[-–—]"  # hyphen, en-dash, em-dash
@@ -108,6 +69,7 @@ FORMULA_PATTERNS = [
     r"\bTiO2\b", r"\bZnO\b", r"\bCeO2\b", r"\bFe3O4\b", r"\bAl2O3\b", r"\bSiO2\b",
     r"\bAg\b", r"\bAu\b", r"\bCu\b", r"\bZn\b", r"\bFe\b", r"\bAl\b"
 ]
+FORMULA_RES = [re.compile(p) for p in FORMULA_PATTERNS]
 
 # 2) carbon family
 CARBON_TERMS = [
@@ -182,8 +144,8 @@ def extract_core_compositions(text: str) -> list[str]:
     cores = set()
 
     # chemical formulas
-    for pat in FORMULA_PATTERNS:
-        for m in re.finditer(pat, t):
+    for rx in FORMULA_RES:
+        for m in rx.finditer(t):
             token = m.group(0)
             tl = token.lower()
             if tl in AMBIGUOUS_SHORT:
@@ -311,10 +273,14 @@ def extract_nanoparticle_name(text: str) -> Optional[str]:
         return f"{base} ({abbr})"
     return base
 
-def extract_nanomaterial_identity(text: str) -> dict:
+def extract_nanomaterial_identity(text: str, characterization: bool = True) -> NanomaterialRecord:
+    """
+    characterization=False skips the characterization regexes, for callers
+    that run extract_characterization_regex separately.
+    """
     cores = extract_core_compositions(text)
 
-    out = dict(NANOMATERIAL_DEFAULTS)
+    out = NanomaterialRecord()
     out["core_compositions"] = cores
     out["nm_category"] = infer_nm_category(cores)
     out["physical_phase"] = extract_polymorph(text)
@@ -323,6 +289,9 @@ def extract_nanomaterial_identity(text: str) -> dict:
     out["catalog_or_batch"] = extract_catalog_or_batch(text)
     # out["evidence"] = pick_evidence(text, cores) if cores else None
 
-    out.update(extract_characterization_regex(text))
+    if characterization:
+        out.update(extract_characterization_regex(text))
+
+    return out
 
-    return out
\ No newline at end of file
+register_patterns(__name__)
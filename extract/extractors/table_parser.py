@@ -1,6 +1,15 @@
 import re
 from typing import Dict, List
 
+from extract.utils.patterns import register_patterns
+
+# Values looked for in table rows whose text names the quantity
+BET_VALUE_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(m2/g|m²/g)", re.I)
+PERCENT_VALUE_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*%")
+NM_VALUE_RE = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*nm")
+MV_VALUE_RE = re.compile(r"([-−]?[0-9]+(?:\.[0-9]+)?)\s*mV", re.I)
+PDI_VALUE_RE = re.compile(r"\bPDI\b\s*([0-9]+(?:\.[0-9]+)?)", re.I)
+
 def parse_table_rows(rows: List[str]) -> Dict[str, str]:
     out = {}
 
@@ -8,12 +17,12 @@ def parse_table_rows(rows: List[str]) -> Dict[str, str]:
         r = row.lower()
 
         if "bet" in r and "m2" in r:
-            m = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*(m2/g|m²/g)", row, re.I)
+            m = BET_VALUE_RE.search(row)
             if m:
                 out["bet_surface_area_m2_g"] = m.group(1)
 
         if "purity" in r:
-            m = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*%", row)
+            m = PERCENT_VALUE_RE.search(row)
             if m:
                 out["purity_percent"] = m.group(1)
 
@@ -24,18 +33,20 @@ def parse_table_rows(rows: List[str]) -> Dict[str, str]:
             out["batch_or_lot_no"] = row
 
         if "dls" in r and "nm" in r:
-            m = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*nm", row)
+            m = NM_VALUE_RE.search(row)
             if m:
                 out.setdefault("dls_mean_diameter_water_nm", m.group(1))
 
         if "zeta" in r and "mv" in r:
-            m = re.search(r"([-−]?[0-9]+(?:\.[0-9]+)?)\s*mV", row, re.I)
+            m = MV_VALUE_RE.search(row)
             if m:
                 out.setdefault("zeta_potential_water_mV", m.group(1))
 
         if "pdi" in r:
-            m = re.search(r"\bPDI\b\s*([0-9]+(?:\.[0-9]+)?)", row, re.I)
+            m = PDI_VALUE_RE.search(row)
             if m:
                 out.setdefault("pdi_water", m.group(1))
 
     return out
+
+register_patterns(__name__)
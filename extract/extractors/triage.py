@@ -0,0 +1,74 @@
+import re
+
+from extract.extractors.nanomaterial import extract_core_compositions
+from extract.utils.patterns import register_patterns
+from extract.utils.sectioning import extract_abstract
+
+# Cheap relevance check run on the front matter before the full-text stages.
+#
+# The score counts nanomaterial vocabulary in the title, author keywords and
+# abstract: each distinct term of the extract_core_compositions lists
+# (formulas, carbon / polymer / QD / MOF / liposome terms) plus each "nano*"
+# word, the latter capped so one long abstract cannot carry a paper alone.
+# Papers scoring below the threshold only get their metadata extracted.
+
+NANO_WORD_RE = re.compile(r"\bnano[a-z-]{2,}", re.I)
+
+MAX_NANO_WORDS = 3
+
+# when no abstract is found, this much of the front pages is scored instead
+FALLBACK_CHARS = 3000
+
+TRIAGE_RELEVANT = "relevant"
+TRIAGE_KEPT = "kept"                    # below the threshold, but listed in the keep list
+TRIAGE_METADATA_ONLY = "metadata_only"
+
+
+def relevance_score(title: str | None, keywords: str | None, front_text: str) -> tuple[int, list[str]]:
+    """
+    (score, matched terms) for a paper's title, author keywords and the
+    abstract found in its front-page text.
+    """
+    text = extract_abstract(front_text) or front_text[:FALLBACK_CHARS]
+    text = "\n".join(t for t in (title, keywords, text) if t)
+    cores = extract_core_compositions(text)
+    nano_words = sorted({w.lower() for w in NANO_WORD_RE.findall(text)})[:MAX_NANO_WORDS]
+    return len(cores) + len(nano_words), cores + nano_words
+
+
+def _keep_key(value: str) -> str:
+    value = value.strip()
+    return value.lower() if value.lower().startswith("10.") else value
+
+
+class TriagePolicy:
+    """
+    Relevance threshold plus a keep list of file paths, file hashes or DOIs
+    that are always fully extracted.
+    """
+
+    def __init__(self, threshold: int = 2, keep=()):
+        self.threshold = threshold
+        self.keep = {_keep_key(k) for k in keep if k.strip()}
+
+    @classmethod
+    def from_file(cls, threshold: int, keep_path: str | None) -> "TriagePolicy":
+        # one path, hash or DOI per line; # comments
+        keep = []
+        if keep_path:
+            with open(keep_path, encoding="utf-8") as f:
+                keep = [line for line in f if line.strip() and not line.lstrip().startswith("#")]
+        return cls(threshold, keep)
+
+    def decide(self, score: int, file_path: str, file_hash: str, doi: str | None) -> str:
+        if score >= self.threshold:
+            return TRIAGE_RELEVANT
+        if {file_path, file_hash, _keep_key(doi or "")} & self.keep:
+            return TRIAGE_KEPT
+        return TRIAGE_METADATA_ONLY
+
+    def __repr__(self):
+        return f"TriagePolicy(threshold={self.threshold}, keep={len(self.keep)})"
+
+
+register_patterns(__name__)
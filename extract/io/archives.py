@@ -0,0 +1,80 @@
+import logging
+import tarfile
+import zipfile
+from typing import Callable, Iterable, Iterator
+
+log = logging.getLogger(__name__)
+
+# Bulk deliveries (zip / tar bundles) are read member by member into memory;
+# nothing is unpacked to disk. A member is recorded as "bundle.zip!dir/paper.pdf".
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+MEMBER_SEP = "!"
+
+
+def is_archive(path: str) -> bool:
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _is_pdf(name: str) -> bool:
+    return name.lower().endswith(".pdf")
+
+
+def iter_archive(path: str, max_size: int | None = None) -> Iterator[tuple[str, bytes]]:
+    """
+    Yields ("archive!member", bytes) for each PDF member of a zip or tar
+    archive, in archive order. Tar files (also compressed) are read as a
+    single forward stream. Members larger than `max_size` bytes are skipped.
+    """
+    if path.lower().endswith(".zip"):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not _is_pdf(info.filename):
+                    continue
+                if max_size is not None and info.file_size > max_size:
+                    log.info("skipped large file", extra={"path": f"{path}{MEMBER_SEP}{info.filename}"})
+                    continue
+                yield f"{path}{MEMBER_SEP}{info.filename}", zf.read(info)
+        return
+
+    # "r|*": sequential stream with transparent decompression, no seeking
+    with tarfile.open(path, mode="r|*") as tf:
+        for member in tf:
+            if not member.isfile() or not _is_pdf(member.name):
+                continue
+            if max_size is not None and member.size > max_size:
+                log.info("skipped large file", extra={"path": f"{path}{MEMBER_SEP}{member.name}"})
+                continue
+            f = tf.extractfile(member)
+            yield f"{path}{MEMBER_SEP}{member.name}", f.read()
+
+
+def read_sources(
+    paths: Iterable[str],
+    max_size: int | None = None,
+    failed: Callable[[], None] | None = None,
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Yields (file_path, bytes) for plain PDF paths and for the PDF members
+    of archive paths. An unreadable plain file or a corrupt archive is
+    logged, reported to `failed` and skipped (members of an archive read
+    before the damage are still yielded).
+    """
+    for path in paths:
+        if not is_archive(path):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError as e:
+                log.error("cannot read file", extra={"path": path, "error": repr(e)})
+                if failed:
+                    failed()
+                continue
+            yield path, data
+            continue
+        try:
+            yield from iter_archive(path, max_size=max_size)
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+            log.error("cannot read archive", extra={"path": path, "error": repr(e)})
+            if failed:
+                failed()
@@ -0,0 +1,150 @@
+import fnmatch
+import hashlib
+import logging
+import os
+from typing import Iterable, Iterator
+
+from extract.io.archives import is_archive
+
+log = logging.getLogger(__name__)
+
+# How symlinks are treated during discovery
+SYMLINK_POLICIES = ("skip", "files", "follow")
+
+
+def _matches(rel: str, patterns: list[str]) -> bool:
+    # Case-insensitive glob on the path relative to the root ("*" also crosses "/")
+    rel = rel.lower()
+    name = rel.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatchcase(rel, p) or fnmatch.fnmatchcase(name, p) for p in patterns)
+
+
+def iter_pdfs(
+    root: str,
+    recursive: bool = True,
+    include: Iterable[str] | None = None,
+    exclude: Iterable[str] | None = None,
+    symlinks: str = "files",
+    max_size: int | None = None,
+    archives: bool = False,
+) -> Iterator[str]:
+    """
+    Yields matching file paths under `root` as they are found (os.scandir,
+    depth first, no full listing held in memory).
+
+    include / exclude are glob patterns matched against the path relative to
+    `root` or the file name (default include: *.pdf); a directory matching an
+    exclude pattern is not entered. symlinks: "skip" ignores links, "files"
+    follows links to files only, "follow" also enters linked directories
+    (each directory at most once). Files larger than `max_size` bytes are
+    skipped. Unreadable directories are logged and skipped. With `archives`,
+    zip / tar files are yielded too (not filtered by include, and not by
+    max_size, which then applies to their members).
+    """
+    if symlinks not in SYMLINK_POLICIES:
+        raise ValueError(f"symlinks must be one of {SYMLINK_POLICIES}")
+    include = [p.lower() for p in (include or ["*.pdf"])]
+    exclude = [p.lower() for p in (exclude or [])]
+
+    seen_dirs: set[tuple[int, int]] = set()
+    stack = [(root, "")]
+    while stack:
+        path, rel_dir = stack.pop()
+        try:
+            if symlinks == "follow":
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) in seen_dirs:
+                    continue
+                seen_dirs.add((st.st_dev, st.st_ino))
+            it = os.scandir(path)
+        except OSError as e:
+            log.warning("cannot read directory", extra={"path": path, "error": repr(e)})
+            continue
+
+        subdirs = []
+        with it:
+            for entry in it:
+                rel = f"{rel_dir}{entry.name}"
+                try:
+                    is_link = entry.is_symlink()
+                    if is_link and symlinks == "skip":
+                        continue
+                    if entry.is_dir(follow_symlinks=symlinks == "follow"):
+                        if recursive and not _matches(rel, exclude):
+                            subdirs.append((entry.path, rel + "/"))
+                        continue
+                    if not entry.is_file():
+                        continue
+                    if _matches(rel, exclude):
+                        continue
+                    if archives and is_archive(rel):
+                        yield entry.path
+                        continue
+                    if not _matches(rel, include):
+                        continue
+                    if max_size is not None and entry.stat().st_size > max_size:
+                        log.info("skipped large file", extra={"path": entry.path})
+                        continue
+                except OSError:
+                    continue  # dangling link or file removed during the walk
+                yield entry.path
+
+        # sorted and reversed so the stack pops directories in name order
+        stack.extend(sorted(subdirs, reverse=True))
+
+
+def iter_manifest(manifest_path: str, max_size: int | None = None) -> Iterator[str]:
+    """
+    Yields paths listed in a manifest file, one per line (blank lines and
+    lines starting with # are ignored). Relative paths are resolved against
+    the manifest's directory; missing files are logged and skipped.
+    """
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            path = line.strip()
+            if not path or path.startswith("#"):
+                continue
+            path = os.path.join(base, path)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                log.warning("manifest file missing", extra={"path": path})
+                continue
+            if max_size is not None and size > max_size and not is_archive(path):
+                log.info("skipped large file", extra={"path": path})
+                continue
+            yield path
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """
+    "i/N" -> (i, N), with 0 <= i < N.
+    """
+    try:
+        index, count = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"shard must look like i/N, got {spec!r}") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"shard index must be in 0..N-1, got {spec!r}")
+    return index, count
+
+
+def shard_of(rel_path: str, count: int) -> int:
+    """
+    Stable shard number of a path relative to the scanned root (or manifest),
+    the same on every node and every run regardless of where the shared
+    filesystem is mounted.
+    """
+    key = rel_path.replace(os.sep, "/").encode("utf-8")
+    return int.from_bytes(hashlib.sha1(key).digest()[:8], "big") % count
+
+
+def in_shard(paths: Iterable[str], root: str, index: int, count: int) -> Iterator[str]:
+    """
+    Keeps the paths that belong to shard `index` of `count`. An archive is
+    one unit: all its members go to the same shard.
+    """
+    for path in paths:
+        if shard_of(os.path.relpath(path, root), count) == index:
+            yield path
@@ -1,7 +1,140 @@
-import pandas as pd
+import os
+import shutil
+from typing import Iterator
 
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+
+def _cell(v):
+    if v is None or isinstance(v, (bool, int, float)):
+        return v
+    return ILLEGAL_CHARACTERS_RE.sub("", str(v))
+
+
+class ExcelStreamWriter:
+    """
+    Writes rows incrementally with openpyxl's write-only mode, so memory stays
+    flat regardless of corpus size.
+
+    Every `flush_every` rows the current workbook is closed as a part file in
+    `<excel_path>.parts/`; finished parts survive a crash and double as the
+    resume marker. close() merges the parts into `excel_path`. On resume, a
+    finished workbook from an earlier run becomes the first part, and rows
+    whose file hash is already written are not written again. Parts with a
+    different header are remapped to `columns` by name; a part with columns
+    that are no longer written cannot be resumed.
+    """
+
+    def __init__(self, excel_path: str, columns: list[str], flush_every: int = 500, resume: bool = False):
+        self.excel_path = excel_path
+        self.columns = list(columns)
+        self.flush_every = flush_every
+        self.parts_dir = excel_path + ".parts"
+
+        if not resume and os.path.isdir(self.parts_dir):
+            shutil.rmtree(self.parts_dir)
+        os.makedirs(self.parts_dir, exist_ok=True)
+        if resume:
+            # fail now, not in close() after the run
+            for path in self._part_paths() or ([excel_path] if os.path.exists(excel_path) else []):
+                self._part_header(path)
+        if resume and os.path.exists(excel_path) and not self._part_paths():
+            os.replace(excel_path, os.path.join(self.parts_dir, "part-00000.xlsx"))
+        self._done = self.done_values() if resume and "file_hash" in self.columns else set()
+        self._part_index = len(self._part_paths())
+        self._wb = None
+        self._ws = None
+        self._rows_in_part = 0
+
+    def _part_paths(self) -> list[str]:
+        return sorted(
+            os.path.join(self.parts_dir, f)
+            for f in os.listdir(self.parts_dir)
+            if f.startswith("part-") and f.endswith(".xlsx")
+        )
+
+    def _part_header(self, path: str) -> list:
+        wb = load_workbook(path, read_only=True)
+        try:
+            header = list(next(wb.active.iter_rows(max_row=1, values_only=True), ()))
+        finally:
+            wb.close()
+        unknown = [str(h) for h in header if h not in self.columns]
+        if unknown:
+            raise SystemExit(
+                f"Cannot resume {self.excel_path}: {os.path.basename(path)} has columns "
+                f"that are no longer written ({', '.join(unknown[:5])})"
+            )
+        return header
+
+    def _part_rows(self, path: str) -> Iterator[list]:
+        # rows of a part in `columns` order, remapped by header name if it differs
+        header = self._part_header(path)
+        pos = {h: i for i, h in enumerate(header)}
+        wb = load_workbook(path, read_only=True)
+        try:
+            for row in wb.active.iter_rows(min_row=2, values_only=True):
+                if header == self.columns:
+                    yield list(row)
+                else:
+                    yield [row[pos[c]] if pos.get(c, len(row)) < len(row) else None for c in self.columns]
+        finally:
+            wb.close()
+
+    def done_values(self, column: str = "file_hash") -> set:
+        """
+        Values of `column` in already flushed parts (e.g. file hashes to skip on resume).
+        """
+        idx = self.columns.index(column)
+        done = set()
+        for path in self._part_paths():
+            for row in self._part_rows(path):
+                if idx < len(row) and row[idx] is not None:
+                    done.add(row[idx])
+        return done
+
+    def write_row(self, row: dict):
+        if row.get("file_hash") in self._done:
+            return
+        if self._ws is None:
+            self._wb = Workbook(write_only=True)
+            self._ws = self._wb.create_sheet()
+            self._ws.append(self.columns)
+        self._ws.append([_cell(row.get(c)) for c in self.columns])
+        self._rows_in_part += 1
+        if self._rows_in_part >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._wb is None:
+            return
+        # Save under a temp name first so a crash never leaves a truncated part.
+        path = os.path.join(self.parts_dir, f"part-{self._part_index:05d}.xlsx")
+        self._wb.save(path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self._part_index += 1
+        self._wb = None
+        self._ws = None
+        self._rows_in_part = 0
+
+    def close(self):
+        self.flush()
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(self.columns)
+        for path in self._part_paths():
+            for row in self._part_rows(path):
+                ws.append(row)
+        wb.save(self.excel_path)
+
+        shutil.rmtree(self.parts_dir)
 
 
 def write_excel(rows: list[dict], excel_path: str):
-    df = pd.DataFrame(rows)
-    df.to_excel(excel_path, index=False)
+    columns = list(rows[0].keys()) if rows else []
+    writer = ExcelStreamWriter(excel_path, columns, flush_every=max(len(rows), 1))
+    for row in rows:
+        writer.write_row(row)
+    writer.close()
@@ -0,0 +1,79 @@
+import json
+import os
+from typing import Iterator
+
+from extract.records import json_default
+
+
+def _iter_records(path: str) -> Iterator[tuple[dict, int]]:
+    """
+    Yields (record, end offset) for each complete line of a JSONL stream;
+    a line cut short by a crash ends the scan.
+    """
+    end = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                return
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                return
+            end += len(line)
+            yield rec, end
+
+def iter_jsonl_results(path: str) -> Iterator[dict]:
+    """
+    Yields the {paper, nanomaterial, bio_effects} results stored in a stream.
+    """
+    for rec, _ in _iter_records(path):
+        yield rec["result"]
+
+
+class JsonlStreamWriter:
+    """
+    Append-only result stream: one line per paper, {"file_hash", "result"}.
+
+    Lines are fsync'ed in batches of `fsync_every`, so a killed run loses at
+    most one batch. With resume=True the existing stream is kept (minus any
+    half-written last line) and its file hashes are reported as done.
+    """
+
+    def __init__(self, path: str, fsync_every: int = 20, resume: bool = False):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._done: set = set()
+        self._pending = 0
+
+        if resume and os.path.exists(path):
+            good_end = 0
+            for rec, good_end in _iter_records(path):
+                self._done.add(rec.get("file_hash"))
+            with open(path, "r+b") as f:
+                f.truncate(good_end)
+            self._f = open(path, "a", encoding="utf-8")
+        else:
+            self._f = open(path, "w", encoding="utf-8")
+
+    def done_values(self) -> set:
+        return set(self._done)
+
+    def write_result(self, result):
+        file_hash = result["paper"].get("file_hash")
+        if file_hash in self._done:
+            return
+        line = json.dumps({"file_hash": file_hash, "result": result}, ensure_ascii=False, default=json_default)
+        self._f.write(line + "\n")
+        self._done.add(file_hash)
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.flush()
+
+    def flush(self):
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        self._f.close()
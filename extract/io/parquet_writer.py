@@ -0,0 +1,88 @@
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as e:  # optional dependency, only needed for --parquet
+    raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+
+
+_ARROW_TYPES = {
+    "str": pa.string(),
+    "int": pa.int32(),
+    "float": pa.float64(),
+    "list": pa.list_(pa.string()),
+}
+
+def build_schema(columns: list[str], types: dict[str, str]) -> pa.Schema:
+    """
+    Arrow schema in `columns` order; `types` maps column -> str|int|float|list
+    (default str).
+    """
+    return pa.schema([(c, _ARROW_TYPES[types.get(c, "str")]) for c in columns])
+
+
+class ParquetStreamWriter:
+    """
+    Writes typed rows to a Parquet file one row group at a time.
+
+    The file is written under a temp name and renamed on close(), so readers
+    never see a file without a footer. With resume=True the row groups of an
+    existing output are copied over first (one group at a time), and rows
+    whose file hash is already present are not written again.
+    """
+
+    def __init__(self, path: str, columns: list[str], types: dict[str, str],
+                 row_group_size: int = 1000, resume: bool = False):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        self.schema = build_schema(columns, types)
+        self.row_group_size = row_group_size
+        self._rows: list[dict] = []
+        self._done: set = set()
+
+        self._writer = pq.ParquetWriter(self.tmp_path, self.schema)
+        if resume and os.path.exists(path):
+            self._copy_existing(path)
+
+    def _copy_existing(self, path: str):
+        old = pq.ParquetFile(path)
+        if old.schema_arrow != self.schema:
+            raise SystemExit(f"Cannot resume {path}: Parquet schema has changed")
+        for i in range(old.num_row_groups):
+            group = old.read_row_group(i)
+            self._done.update(h for h in group.column("file_hash").to_pylist() if h)
+            self._writer.write_table(group)
+
+    def done_values(self) -> set:
+        """
+        File hashes already present in the resumed output.
+        """
+        return set(self._done)
+
+    def write_row(self, row: dict):
+        if row.get("file_hash") in self._done:
+            return
+        self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        table = pa.Table.from_pylist(self._rows, schema=self.schema)
+        self._writer.write_table(table)
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+        os.replace(self.tmp_path, self.path)
+
+
+def iter_rows(path: str, batch_size: int = 1000):
+    """
+    Yields the rows of a Parquet output as dicts, one batch in memory at a time.
+    """
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
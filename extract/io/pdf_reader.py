@@ -1,28 +1,59 @@
-import fitz  # pymupdf
+import os
+from contextlib import contextmanager
+from typing import Iterator
 
+# PyMuPDF (fitz) is imported on the first open, not with this module, so that
+# commands which never read a PDF start quickly.
 
-def extract_first_page_dict(pdf_path: str) -> dict:
-    doc = fitz.open(pdf_path)
-    page = doc[0]
-    d = page.get_text("dict")
-    doc.close()
-    return d
 
-def extract_pdf_text_first_pages(pdf_path: str, max_pages: int = 3) -> list[dict]:
-    doc = fitz.open(pdf_path)
-    n = min(len(doc), max_pages)
-    pages = []
-    for i in range(n):
-        pages.append({"page": i + 1, "text": doc[i].get_text("text")})
-    doc.close()
+def open_pdf(source: str | bytes):
+    """
+    Open a PDF from a path or from its bytes (no temp file).
+    """
+    import fitz  # pymupdf
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+@contextmanager
+def opened_pdf(pdf):
+    # An already open document belongs to the caller and is left open.
+    if not isinstance(pdf, (str, os.PathLike, bytes, bytearray, memoryview)):
+        yield pdf
+        return
+    doc = open_pdf(pdf)
+    try:
+        yield doc
+    finally:
+        doc.close()
+
+def extract_first_page_dict(pdf) -> dict:
+    with opened_pdf(pdf) as doc:
+        return doc[0].get_text("dict")
+
+def extract_pdf_text_first_pages(pdf, max_pages: int = 3) -> list[dict]:
+    with opened_pdf(pdf) as doc:
+        n = min(len(doc), max_pages)
+        pages = []
+        for i in range(n):
+            pages.append({"page": i + 1, "text": doc[i].get_text("text")})
     return pages
 
-def extract_pdf_text_all_pages(pdf_path: str) -> list[dict]:
-    doc = fitz.open(pdf_path)
-    pages = []
-    for i in range(len(doc)):
-        pages.append({"page": i + 1, "text": doc[i].get_text("text")})
-    doc.close()
+def iter_page_texts(doc, max_pages: int | None = None) -> Iterator[dict]:
+    """
+    Yields {page, text} for the pages of an open document one at a time, so
+    a caller that has what it needs can stop before the rest are extracted.
+    """
+    n = len(doc) if max_pages is None else min(len(doc), max_pages)
+    for i in range(n):
+        yield {"page": i + 1, "text": doc[i].get_text("text")}
+
+def extract_pdf_text_all_pages(pdf) -> list[dict]:
+    with opened_pdf(pdf) as doc:
+        pages = []
+        for i in range(len(doc)):
+            pages.append({"page": i + 1, "text": doc[i].get_text("text")})
     return pages
 
 def join_pages(pages: list[dict]) -> str:
@@ -33,4 +64,4 @@ def remove_references(text: str) -> str:
     idx = low.find("\nreferences\n")
     if idx == -1:
         idx = low.find("\nreference\n")
-    return text[:idx] if idx != -1 else text
\ No newline at end of file
+    return text[:idx] if idx != -1 else text
@@ -5,6 +5,8 @@ import re
 import requests
 from typing import Any, Dict, Optional, Tuple
 
+from extract.records import NanomaterialRecord, PaperRecord
+
 
 # ---------------------------
 # Low-level helpers
@@ -81,40 +83,9 @@ def ollama_chat(
 # Patch-based refinement
 # ---------------------------
 
-_ALLOWED_PAPER_FIELDS = {
-    "title", "year", "doi", "source_url",
-    "article_type", "author_keywords", "mesh_keywords",
-}
-
-_ALLOWED_NANO_FIELDS = {
-    "core_compositions", "nm_category", "physical_phase", "crystallinity",
-    "cas_number", "catalog_or_batch",
-}
-_ALLOWED_NANO_FIELDS |= {
-    "bet_surface_area_m2_g",
-    "dls_mean_diameter_water_nm",
-    "dls_mean_diameter_medium_nm",
-    "pdi_water",
-    "pdi_medium",
-    "zeta_potential_water_mV",
-    "zeta_potential_medium_mV",
-    "tem_diameter_nm",
-    "tem_width_nm_median",
-    "tem_length_nm_median",
-    "no_of_walls",
-    "purity_percent",
-    "impurities",
-    "supplier_manufacturer",
-    "address",
-    "supplier_code",
-    "batch_or_lot_no",
-    "nominal_diameter_nm",
-    "nominal_length_micron",
-    "nominal_specific_surface_area_m2_g",
-    "dispersant",
-    "description_of_dispersion",
-    "endotoxins_EU_mg",
-}
+# Fields a patch may set, from the record definitions
+_ALLOWED_PAPER_FIELDS = PaperRecord.llm_fields()
+_ALLOWED_NANO_FIELDS = NanomaterialRecord.llm_fields()
 
 def _sanitize_patch(patch: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -0,0 +1,159 @@
+import json
+import re
+import sqlite3
+
+from extract.extractors import STAGE_VERSIONS
+from extract.utils.minhash import band_keys, similarity
+from extract.utils.patterns import register_patterns
+
+# Near-duplicate detection (--dedup): one paper delivered as a preprint, an
+# accepted manuscript and the publisher version has three file hashes. Each
+# paper is matched against the canonical (non-duplicate) papers, first by DOI
+# and then by MinHash similarity of its first page (extract.utils.minhash,
+# LSH bands as the candidate index). A duplicate only gets its metadata and
+# is linked to the canonical paper through paper.duplicate_of.
+#
+# Which copy is canonical: the publisher version beats an accepted
+# manuscript, which beats an unclassified copy, which beats a preprint. On a
+# tie the copy seen first stays canonical. A newcomer that outranks the
+# canonical copy is extracted in full and takes over; the old copy and its
+# duplicates are relinked to it.
+
+PREPRINT_RE = re.compile(
+    r"\b(arxiv|biorxiv|medrxiv|chemrxiv|preprints?\.org|ssrn|research square|preprint|"
+    r"not (?:yet )?(?:been )?(?:certified by )?peer[- ]review(?:ed)?)\b",
+    re.I,
+)
+ACCEPTED_RE = re.compile(
+    r"\b(accepted manuscript|author manuscript|author'?s? accepted|accepted for publication|"
+    r"journal pre-proof|uncorrected proof)\b",
+    re.I,
+)
+PUBLISHER_RE = re.compile(r"©\s*(?:19|20)\d{2}|\ball rights reserved\b|\bpublished by\b", re.I)
+
+VERSION_RANKS = {"preprint": 0, "unknown": 1, "accepted": 2, "publisher": 3}
+
+
+def version_kind(first_page: str, metadata_sources: dict | None = None) -> str:
+    """
+    "preprint", "accepted", "publisher" or "unknown" from the first page
+    text; a DOI embedded by the publisher (XMP / info dict) also counts as
+    the publisher version.
+    """
+    if PREPRINT_RE.search(first_page):
+        return "preprint"
+    if ACCEPTED_RE.search(first_page):
+        return "accepted"
+    if PUBLISHER_RE.search(first_page) or (metadata_sources or {}).get("doi") in ("xmp", "info"):
+        return "publisher"
+    return "unknown"
+
+
+def _doi_key(doi: str | None) -> str | None:
+    return doi.strip().lower() if doi else None
+
+
+class DuplicateIndex:
+    """
+    DOI and LSH band lookups over the canonical papers of a database and of
+    the current run. Used from one thread (the extraction stage).
+    """
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.entries: dict[str, tuple] = {}   # file_hash -> (doi, kind, signature)
+        self.by_doi: dict[str, str] = {}
+        self.by_band: dict[tuple, set[str]] = {}
+        # (file_hash, doi, kind, signature, superseded) of the paper the last
+        # resolve() made canonical, until commit() or discard()
+        self.pending: tuple | None = None
+
+    def load(self, conn: sqlite3.Connection) -> int:
+        """
+        Adds the stored canonical papers (signatures of the current dedup
+        version only). Returns how many were added.
+        """
+        rows = conn.execute("""
+            SELECT p.file_hash, p.doi, p.version_kind, s.version, s.output
+            FROM papers p LEFT JOIN stage_results s ON s.paper_id = p.id AND s.stage = 'dedup'
+            WHERE p.duplicate_of IS NULL
+        """)
+        n = 0
+        for file_hash, doi, kind, version, output in rows:
+            sig = None
+            if output and version == STAGE_VERSIONS["dedup"]:
+                sig = json.loads(output)["minhash"]
+            self.add(file_hash, doi, kind or "unknown", sig)
+            n += 1
+        return n
+
+    def add(self, file_hash: str, doi: str | None, kind: str, sig: list[int] | None):
+        if file_hash in self.entries:
+            self.remove(file_hash)
+        self.entries[file_hash] = (_doi_key(doi), kind, sig)
+        if doi:
+            self.by_doi.setdefault(_doi_key(doi), file_hash)
+        if sig:
+            for key in band_keys(sig):
+                self.by_band.setdefault(key, set()).add(file_hash)
+
+    def remove(self, file_hash: str):
+        doi, _, sig = self.entries.pop(file_hash)
+        if doi and self.by_doi.get(doi) == file_hash:
+            del self.by_doi[doi]
+        if sig:
+            for key in band_keys(sig):
+                self.by_band.get(key, set()).discard(file_hash)
+
+    def find(self, file_hash: str, doi: str | None, sig: list[int] | None) -> tuple[str, str, float] | None:
+        """
+        (canonical file hash, its kind, similarity) of the paper this one
+        duplicates, or None. A DOI match counts as similarity 1.0.
+        """
+        match = self.by_doi.get(_doi_key(doi)) if doi else None
+        if match and match != file_hash:
+            return match, self.entries[match][1], 1.0
+        if not sig:
+            return None
+        best = None
+        candidates = set().union(*(self.by_band.get(key, ()) for key in band_keys(sig)))
+        for other in candidates - {file_hash}:
+            s = similarity(sig, self.entries[other][2])
+            if s >= self.threshold and (best is None or s > best[2]):
+                best = (other, self.entries[other][1], s)
+        return best
+
+    def resolve(self, file_hash: str, doi: str | None, kind: str, sig: list[int] | None) -> tuple[str | None, str | None]:
+        """
+        Applies the version policy to a newly extracted paper. Returns
+        (duplicate_of, supersedes): the canonical paper this one duplicates,
+        or the canonical paper it replaces. A paper that becomes canonical
+        is only added to the index by commit(), once its extraction has
+        succeeded; discard() drops it.
+        """
+        self.pending = None
+        match = self.find(file_hash, doi, sig)
+        if match and VERSION_RANKS[kind] <= VERSION_RANKS[match[1]]:
+            return match[0], None
+        supersedes = match[0] if match else None
+        self.pending = (file_hash, doi, kind, sig, supersedes)
+        return None, supersedes
+
+    def commit(self):
+        # registers the paper the last resolve() made canonical, replacing the one it supersedes
+        if self.pending is None:
+            return
+        file_hash, doi, kind, sig, supersedes = self.pending
+        self.pending = None
+        if supersedes in self.entries:
+            self.remove(supersedes)
+        self.add(file_hash, doi, kind, sig)
+
+    def discard(self):
+        self.pending = None
+
+    def __len__(self):
+        return len(self.entries)
+
+
+register_patterns(__name__)
@@ -0,0 +1,95 @@
+import logging
+import os
+from typing import Iterator
+
+from extract.db.sqlite import init_sqlite, iter_results, load_stage_results, store_stage_results
+from extract.io.jsonl_writer import iter_jsonl_results
+from extract.pipeline.outputs import Outputs
+from extract.records import from_excel_row
+
+log = logging.getLogger(__name__)
+
+# Combines the outputs of sharded runs (`--shard i/N` on several nodes) into
+# one. Inputs may be SQLite databases, JSONL streams or Parquet files, mixed.
+# A paper present in several inputs (same file hash) is written once: the
+# copy with the highest extractor_version wins; among equal versions a SQLite
+# copy (which carries the page text for search) beats JSONL / Parquet, then
+# the later input wins. A winning SQLite copy brings its stored stage outputs,
+# so reruns against the merged database reuse them.
+
+
+def _is_sqlite(path: str) -> bool:
+    return not path.lower().endswith((".jsonl", ".json", ".parquet"))
+
+
+def _iter_input(path: str, pages: bool = True, stages: bool = False) -> Iterator[tuple[dict, list[dict], dict]]:
+    # (result, pages, stage results) from one input; only SQLite inputs carry
+    # page text and stage results
+    lower = path.lower()
+    if lower.endswith((".jsonl", ".json")):
+        for result in iter_jsonl_results(path):
+            yield result, [], {}
+    elif lower.endswith(".parquet"):
+        from extract.io.parquet_writer import iter_rows  # optional pyarrow dependency
+        for row in iter_rows(path):
+            yield from_excel_row(row), [], {}
+    else:
+        conn = init_sqlite(path)
+        try:
+            for result, page_rows in iter_results(conn, pages=pages):
+                stage_results = load_stage_results(conn, result["paper"]["file_hash"]) if stages else {}
+                yield result, page_rows, stage_results
+        finally:
+            conn.close()
+
+
+def _version(result) -> int:
+    return result["paper"].get("extractor_version") or 0
+
+
+def merge_outputs(
+    inputs: list[str],
+    sqlite_db_path: str | None = None,
+    jsonl_path: str | None = None,
+    excel_path: str | None = None,
+    parquet_path: str | None = None,
+) -> dict:
+    """
+    Merge `inputs` into the given outputs, deduplicated by file hash.
+    Inputs are read twice (pick winners, then copy them), so only the
+    file hashes are held in memory. Returns {"read", "written", "duplicates"}.
+    """
+    for path in inputs:
+        if not os.path.exists(path):
+            raise SystemExit(f"merge: input not found: {path}")
+
+    # pass 1: file hash -> (version, has text, input index, position) of the winning copy
+    best: dict[str, tuple[int, bool, int, int]] = {}
+    read = 0
+    for i, path in enumerate(inputs):
+        for pos, (result, _, _) in enumerate(_iter_input(path, pages=False)):
+            read += 1
+            key = (_version(result), _is_sqlite(path), i, pos)
+            file_hash = result["paper"].get("file_hash")
+            if file_hash not in best or key > best[file_hash]:
+                best[file_hash] = key
+
+    winners = {(i, pos) for _, _, i, pos in best.values()}
+    outputs = Outputs(
+        sqlite_db_path=sqlite_db_path, excel_path=excel_path,
+        parquet_path=parquet_path, jsonl_path=jsonl_path,
+    )
+    written = 0
+    try:
+        for i, path in enumerate(inputs):
+            for pos, (result, pages, stage_results) in enumerate(_iter_input(path, stages=sqlite_db_path is not None)):
+                if (i, pos) in winners:
+                    outputs.write(result, pages)
+                    if outputs.conn:
+                        store_stage_results(outputs.conn, result["paper"]["file_hash"], stage_results)
+                    written += 1
+            log.info("merged input", extra={"path": path})
+    finally:
+        outputs.close()
+
+    return {"read": read, "written": written, "duplicates": read - written}
@@ -0,0 +1,187 @@
+import logging
+
+from extract.records import EXCEL_COLUMNS, SECTIONS, to_excel_row
+from extract.utils.units import QUANTITY_FIELDS, parse_quantity
+from extract.utils.sectioning import split_sections
+from extract.db.sqlite import (
+    init_sqlite, upsert_paper_and_nanomat, store_paper_text, existing_file_hashes, load_result, store_stage_results,
+    relink_duplicates,
+)
+from extract.io.jsonl_writer import JsonlStreamWriter, iter_jsonl_results
+
+log = logging.getLogger(__name__)
+
+
+class Outputs:
+    """
+    The result sinks of one run: SQLite, or Excel when no database is given,
+    plus optional Parquet and JSONL. Once constructed, only one thread (the
+    writer stage) may call write() and close().
+    """
+
+    def __init__(
+        self,
+        sqlite_db_path: str | None = None,
+        excel_path: str | None = None,
+        parquet_path: str | None = None,
+        jsonl_path: str | None = None,
+        resume: bool = False,
+    ):
+        self.sqlite_db_path = sqlite_db_path
+        self.excel_path = excel_path
+        self.parquet_path = parquet_path
+        self.jsonl_path = jsonl_path
+
+        self.conn = None
+        if sqlite_db_path:
+            # handed over to the writer thread after construction
+            self.conn = init_sqlite(sqlite_db_path, check_same_thread=False)
+
+        self.excel_writer = None
+        if not self.conn and excel_path:
+            from extract.io.excel_writer import ExcelStreamWriter  # openpyxl, only for Excel output
+            self.excel_writer = ExcelStreamWriter(excel_path, EXCEL_COLUMNS, resume=resume)
+
+        self.parquet_writer = None
+        if parquet_path:
+            from extract.io.parquet_writer import ParquetStreamWriter  # optional pyarrow dependency
+            self.parquet_writer = ParquetStreamWriter(parquet_path, PARQUET_COLUMNS, PARQUET_TYPES, resume=resume)
+
+        self.jsonl_writer = None
+        if jsonl_path:
+            self.jsonl_writer = JsonlStreamWriter(jsonl_path, resume=resume)
+
+    def done_hashes(self) -> set:
+        """
+        File hashes that every active output already holds (skipped on resume).
+        """
+        done_sets = []
+        if self.conn:
+            done_sets.append(existing_file_hashes(self.conn))
+        if self.excel_writer:
+            done_sets.append(self.excel_writer.done_values("file_hash"))
+        if self.parquet_writer:
+            done_sets.append(self.parquet_writer.done_values())
+        if self.jsonl_writer:
+            done_sets.append(self.jsonl_writer.done_values())
+        return set.intersection(*done_sets) if done_sets else set()
+
+    def write(self, result, pages_all: list[dict]):
+        # JSONL first: it is the cheapest durable record of the paper
+        if self.jsonl_writer:
+            self.jsonl_writer.write_result(result)
+
+        # Save to SQLite or Excel (+ Parquet if requested)
+        if self.conn:
+            if result["paper"].get("stages") is not None:
+                fill_unselected(result, load_result(self.conn, result["paper"]["file_hash"]))
+            status = upsert_paper_and_nanomat(self.conn, result)
+            stage_outputs = getattr(result, "stage_outputs", None) or {}
+            store_paper_text(self.conn, result["paper"]["file_hash"], split_sections(pages_all),
+                             replace="full_text" in stage_outputs)
+            # also for unchanged results: a recomputed stage may give the same fields
+            store_stage_results(self.conn, result["paper"]["file_hash"], stage_outputs)
+            if getattr(result, "supersedes", None):
+                relink_duplicates(self.conn, result.supersedes, result["paper"]["file_hash"])
+            log.debug("sqlite write", extra={"file": result["paper"].get("file_path"), "status": status})
+        elif self.excel_writer:
+            self.excel_writer.write_row(flatten_for_excel(result))
+        if self.parquet_writer:
+            self.parquet_writer.write_row(flatten_for_parquet(result))
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            log.info("saved", extra={"output": "sqlite", "path": self.sqlite_db_path})
+        elif self.excel_writer:
+            self.excel_writer.close()
+            log.info("saved", extra={"output": "excel", "path": self.excel_path})
+        if self.parquet_writer:
+            self.parquet_writer.close()
+            log.info("saved", extra={"output": "parquet", "path": self.parquet_path})
+        if self.jsonl_writer:
+            self.jsonl_writer.close()
+            log.info("saved", extra={"output": "jsonl", "path": self.jsonl_path})
+
+
+def fill_unselected(result, stored: dict | None):
+    """
+    A selective run (paper.stages set) only fills the fields of its stages.
+    Before it replaces a stored row, the other fields are copied from the
+    stored result so they are not lost.
+    """
+    if not stored:
+        return
+    selected = set(result["paper"]["stages"])
+    for section, cls in SECTIONS.items():
+        for f in cls.FIELDS:
+            if f.stage and f.stage not in selected and f.name in stored[section]:
+                result[section][f.name] = stored[section][f.name]
+
+
+def export_jsonl(jsonl_path: str, excel_path: str | None = None, parquet_path: str | None = None):
+    """
+    Build Excel and/or Parquet outputs from a JSONL result stream after the run.
+    """
+    outputs = Outputs(excel_path=excel_path, parquet_path=parquet_path)
+    n = 0
+    for result in iter_jsonl_results(jsonl_path):
+        outputs.write(result, pages_all=[])
+        n += 1
+    outputs.close()
+    log.info("exported", extra={"results": n, "source": jsonl_path})
+
+
+def flatten_for_excel(result) -> dict:
+    # Columns and their order come from the field definitions in extract.records
+    return to_excel_row(result)
+
+def _to_int(v):
+    try:
+        return int(v) if v is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def flatten_for_parquet(result) -> dict:
+    """
+    Same columns as flatten_for_excel, but typed: int year / version /
+    relevance score, list-valued
+    core_compositions, and numeric value/low/high/unit columns parsed from
+    the characterization strings.
+    """
+    row = flatten_for_excel(result)
+    nano = result.get("nanomaterial", {})
+
+    cores = nano.get("core_compositions")
+    if not isinstance(cores, list):
+        cores = [cores] if cores else []
+    row["core_compositions"] = [str(c) for c in cores]
+    for k in PARQUET_INT_FIELDS:
+        row[k] = _to_int(row[k])
+
+    for k, v in row.items():
+        if k not in PARQUET_TYPES and v is not None and not isinstance(v, str):
+            row[k] = str(v)
+
+    for field, default_unit in QUANTITY_FIELDS.items():
+        q = parse_quantity(row.get(field), default_unit)
+        for part in ("value", "low", "high", "unit"):
+            row[f"{field}_{part}"] = q[part]
+
+    viab = parse_quantity(row.get("cell_viability"))
+    row["cell_viability_value"] = viab["value"]
+    row["cell_viability_unit"] = viab["unit"]
+    return row
+
+# integer paper fields (everything else non-numeric is written as a string)
+PARQUET_INT_FIELDS = ("year", "extractor_version", "relevance_score")
+
+PARQUET_TYPES = {"core_compositions": "list", "cell_viability_value": "float"}
+PARQUET_TYPES.update({k: "int" for k in PARQUET_INT_FIELDS})
+PARQUET_TYPES.update({
+    f"{field}_{part}": "float"
+    for field in QUANTITY_FIELDS
+    for part in ("value", "low", "high")
+})
+
+PARQUET_COLUMNS = list(flatten_for_parquet({}).keys())
@@ -0,0 +1,154 @@
+from typing import Callable
+
+from extract.extractors import STAGE_VERSIONS
+from extract.records import SECTIONS
+
+# Which extraction stages process_pdf runs for a job, and which stored stage
+# outputs it may reuse.
+#
+# Output stages fill record fields (Field.stage in extract.records); the other
+# stages only produce inputs for them. A run limited with --stages / --fields
+# runs the requested output stages plus everything they depend on, so e.g. a
+# metadata-only job never extracts the full text or the tables.
+#
+# With a database, each stage's output is stored with its version
+# (extract.extractors.STAGE_VERSIONS). A rerun reuses a stored output unless
+# the stage's version or parameters changed or one of its inputs was just
+# recomputed. The LLM patch is the exception: it is only redone when the LLM
+# stage itself changes, and is merged again onto the new rule results.
+
+# stage -> stages whose output it reads
+STAGE_DEPS = {
+    "embedded": (),                    # XMP / info dictionary
+    "layout_title": ("embedded",),     # largest first-page text, if nothing is embedded
+    "metadata": ("embedded", "layout_title"),  # front pages, page by page
+    "triage": ("metadata",),           # relevance score of the front matter (--triage)
+    "dedup": ("metadata",),            # first-page signature and version kind (--dedup)
+    "full_text": (),
+    "table_rows": (),
+    "nanomaterial": ("full_text",),
+    "characterization": ("full_text", "table_rows"),
+    "bio_effects": ("full_text",),
+    "snippets": ("full_text",),
+    "llm": ("metadata", "snippets", "table_rows"),  # front pages as title / abstract / keywords context
+}
+
+# stages that fill record fields, in pipeline order
+OUTPUT_STAGES = ("metadata", "nanomaterial", "characterization", "bio_effects")
+
+# field name (also "section.field") -> output stage
+FIELD_STAGES: dict[str, str] = {}
+for _section, _cls in SECTIONS.items():
+    for _f in _cls.FIELDS:
+        if _f.stage:
+            FIELD_STAGES[f"{_section}.{_f.name}"] = _f.stage
+            FIELD_STAGES.setdefault(_f.name, _f.stage)
+
+
+def _split(values) -> list[str]:
+    # accepts lists and comma-separated strings ("doi,year")
+    if isinstance(values, str):
+        values = [values]
+    return [v.strip() for item in values or [] for v in item.split(",") if v.strip()]
+
+
+class StagePlan:
+    """
+    The stages to run for one job. `selected` holds the requested output
+    stages, or None when everything is extracted. `triage` and `dedup` add
+    the relevance check and the duplicate check (and so the metadata they
+    read).
+    """
+
+    def __init__(self, selected: frozenset | None, use_llm: bool = False, triage: bool = False,
+                 dedup: bool = False):
+        self.selected = selected
+        wanted = set(OUTPUT_STAGES if selected is None else selected)
+        if use_llm:
+            wanted.add("llm")
+        if triage:
+            wanted.add("triage")
+        if dedup:
+            wanted.add("dedup")
+        todo = list(wanted)
+        while todo:
+            for dep in STAGE_DEPS[todo.pop()]:
+                if dep not in wanted:
+                    wanted.add(dep)
+                    todo.append(dep)
+        self.stages = frozenset(wanted)
+
+    def needs(self, stage: str) -> bool:
+        return stage in self.stages
+
+    def has_field(self, section: str, name: str) -> bool:
+        """
+        True if this plan fills the field (bookkeeping fields always).
+        """
+        stage = FIELD_STAGES.get(f"{section}.{name}")
+        return stage is None or stage in self.stages
+
+    def __repr__(self):
+        return f"StagePlan({sorted(self.stages)})"
+
+
+def resolve_plan(stages=None, fields=None, use_llm: bool = False, triage: bool = False,
+                 dedup: bool = False) -> StagePlan:
+    """
+    StagePlan for the requested output `stages` and/or record `fields`
+    (names like "doi" or "nanomaterial.core_compositions"; a field selects
+    the whole stage that fills it). Nothing requested means everything.
+    Raises ValueError for unknown names.
+    """
+    stages, fields = _split(stages), _split(fields)
+    if not stages and not fields:
+        return StagePlan(None, use_llm, triage, dedup)
+
+    selected = set()
+    for s in stages:
+        if s not in OUTPUT_STAGES:
+            raise ValueError(f"unknown stage {s!r} (choose from {', '.join(OUTPUT_STAGES)})")
+        selected.add(s)
+    for f in fields:
+        if f not in FIELD_STAGES:
+            raise ValueError(f"unknown or non-extracted field {f!r}")
+        selected.add(FIELD_STAGES[f])
+    return StagePlan(frozenset(selected), use_llm, triage, dedup)
+
+
+# marks a stage without a usable stored output
+MISSING = object()
+
+
+class StageCache:
+    """
+    Stored stage outputs of one paper: {stage: (version, params, output)}.
+    The full_text output is the stored page text, read with `load_pages`
+    only when it is used.
+    """
+
+    def __init__(self, entries: dict[str, tuple], load_pages: Callable[[], list[dict]]):
+        self.entries = entries
+        self._load_pages = load_pages
+        self._pages = None
+
+    @property
+    def pages(self) -> list[dict]:
+        if self._pages is None:
+            self._pages = self._load_pages()
+        return self._pages
+
+    def get(self, stage: str, params: dict | None = None):
+        """
+        The stored output of `stage` if it was made by the current version
+        with the same params, else MISSING.
+        """
+        entry = self.entries.get(stage)
+        if entry is None:
+            return MISSING
+        version, stored_params, output = entry
+        if version != STAGE_VERSIONS[stage] or (stored_params or None) != (params or None):
+            return MISSING
+        if stage == "full_text":
+            return self.pages or MISSING
+        return output
@@ -1,225 +1,583 @@
+import copy
+import functools
+import itertools
+import logging
 import os
-from extract.utils.hashing import sha256_file
+import queue
+from contextlib import ExitStack, nullcontext
+
+from extract.utils.hashing import sha256_bytes
 from extract.utils.text import one_line, remove_references
 from extract.extractors.metadata import (
-    extract_paper_metadata, 
+    scan_paper_metadata,
     extract_title_from_first_page_layout,
+    SOURCE_LAYOUT,
+    SOURCE_LLM,
 )
 from extract.extractors.nanomaterial import extract_nanomaterial_identity
+from extract.extractors.characterization_regex import extract_characterization_regex
 from extract.extractors.bio_effects import extract_bio_effects
+from extract.extractors import EXTRACTOR_VERSION, STAGE_VERSIONS
+from extract.extractors.embedded_metadata import read_created_year, read_embedded_metadata
+from extract.extractors.triage import TRIAGE_METADATA_ONLY, TriagePolicy, relevance_score
+from extract.pipeline.dedup import DuplicateIndex, version_kind
+from extract.utils.minhash import minhash
 from extract.utils.merge import merge_patch
+from extract.records import BioEffectsRecord, ExtractionResult, NanomaterialRecord, PaperRecord
 from extract.utils.sectioning import extract_abstract, extract_keywords_hint
 from extract.utils.snippets import extract_descriptor_snippets
-from extract.llm.ollama_client import refine_patch_with_ollama # This can be changed with any LLM client or stub
-from extract.db.sqlite import init_sqlite, upsert_paper_and_insert_nanomat
 from extract.io.pdf_reader import (
-    extract_pdf_text_first_pages,
+    opened_pdf,
+    iter_page_texts,
     extract_pdf_text_all_pages,
     extract_first_page_dict,
     join_pages,
 )
-from extract.io.excel_writer import write_excel
 from extract.extractors.table_extractor import extract_table_rows
 from extract.extractors.table_parser import parse_table_rows
+from extract.pipeline.outputs import (
+    Outputs,
+    flatten_for_excel,
+    flatten_for_parquet,
+    EXCEL_COLUMNS,
+    PARQUET_COLUMNS,
+    PARQUET_TYPES,
+)
+from extract.db.sqlite import init_sqlite, load_paper_pages, load_stage_results
+from extract.io.discovery import in_shard, iter_manifest, iter_pdfs
+from extract.pipeline.plan import MISSING, OUTPUT_STAGES, STAGE_DEPS, StageCache, StagePlan, resolve_plan
+from extract.pipeline.stages import DONE, Stage, drain, prefetch_files, put
+from extract.utils.timing import RunReport, SlowestProfiles, StageTimer
+from extract.utils import patterns
+from extract.utils.logs import DUMP_LOGGER, Progress
 
+log = logging.getLogger(__name__)
+dump = logging.getLogger(DUMP_LOGGER)
 
 
 
 def list_pdfs(pdf_dir: str) -> list[str]:
-    return [
-        os.path.join(pdf_dir, f)
-        for f in os.listdir(pdf_dir)
-        if f.lower().endswith(".pdf")
-    ]
+    return list(iter_pdfs(pdf_dir, recursive=False))
 
-def run_pipeline(
-    pdf_dir: str,
+def process_pdf(
+    pdf,
+    file_path: str,
+    file_hash: str,
     use_llm: bool,
     llm_model: str,
-    sqlite_db_path: str | None,
-    excel_path: str,
     max_pages: int = 3,
-):
-    pdfs = list_pdfs(pdf_dir)
-    if not pdfs:
-        raise SystemExit("No PDF files found in --pdf_dir")
-
-    conn = None
-    if sqlite_db_path:
-        conn = init_sqlite(sqlite_db_path)
-
-    excel_rows = []
-
-    for pdf_path in pdfs:
-        file_hash = sha256_file(pdf_path)
-
-        # Extract metadata from first pages (title, year, doi, keywords, etc.)
-        pages_meta = extract_pdf_text_first_pages(pdf_path, max_pages=max_pages)
-
-        text_meta = join_pages(pages_meta)
-        print(text_meta[:500])
-
-        page1_dict = extract_first_page_dict(pdf_path)
-        title_layout = extract_title_from_first_page_layout(page1_dict)
-        print("====> TITLE FROM LAYOUT:", title_layout, " <====")
-        meta = extract_paper_metadata(text=text_meta, pages=pages_meta, file_path=pdf_path, file_hash=file_hash)
-
-        if title_layout:
-            meta["title"] = title_layout
-
-        pages_all = extract_pdf_text_all_pages(pdf_path)
-        text_all = join_pages(pages_all)
-
-        table_rows = extract_table_rows(pdf_path)
-        table_fields = parse_table_rows(table_rows)
-
-
-
-        text_all_clean = remove_references(text_all)
-        descriptor_snips = extract_descriptor_snippets(text_all_clean)
-        nano = extract_nanomaterial_identity(text=text_all_clean)
-        bio = extract_bio_effects(text_all_clean)
-
-
-        for k, v in table_fields.items():
-            if v and not nano.get(k):
-                nano[k] = v
+    timer: StageTimer | None = None,
+    plan: StagePlan | None = None,
+    cache: StageCache | None = None,
+    triage: TriagePolicy | None = None,
+    dedup: DuplicateIndex | None = None,
+) -> tuple[ExtractionResult, list[dict]]:
+    """
+    Runs every extractor on one PDF (path, bytes or open fitz document),
+    opening it only once. Returns (result, pages_all); per-stage wall
+    times are added to `timer` if given.
+
+    A `plan` (extract.pipeline.plan) limits the run to some output stages
+    and what they depend on; fields of the other stages keep their defaults,
+    pages_all is empty without the full-text pass, and paper.stages lists
+    the stages that ran.
+
+    With a `cache` of the paper's stored stage outputs, a stage is only
+    recomputed if its version or params changed or an input was recomputed;
+    the PDF is not opened when nothing reads it. The recomputed outputs are
+    put on result.stage_outputs.
+
+    With a `triage` policy, papers whose front matter scores below its
+    threshold (extract.extractors.triage) only get their metadata;
+    paper.relevance_score and paper.triage record the decision.
+
+    With a `dedup` index (extract.pipeline.dedup), a paper matching a
+    canonical paper by DOI or first-page similarity, and not a better
+    version of it, only gets its metadata and paper.duplicate_of. A paper
+    that becomes canonical is left pending on the index until the caller
+    keeps the result (dedup.commit()) or drops it (dedup.discard()).
+    """
+    t = timer or StageTimer()
+    plan = plan or StagePlan(None, use_llm, triage is not None, dedup is not None)
+    supersedes = None
+    recomputed: dict[str, tuple] = {}
+
+    def run(stage: str, fn, params: dict | None = None, deps: tuple = None):
+        # stored output if still valid, else fn() (recorded for storing)
+        deps = STAGE_DEPS[stage] if deps is None else deps
+        if cache is not None and not any(d in recomputed for d in deps):
+            output = cache.get(stage, params)
+            if output is not MISSING:
+                return output
+        output = fn()
+        recomputed[stage] = (STAGE_VERSIONS[stage], params, None if stage == "full_text" else copy.deepcopy(output))
+        return output
+
+    with ExitStack() as stack:
+        doc = None
+
+        def get_doc():
+            # opened outside the calling stage's timer, so the open is only timed once
+            nonlocal doc
+            if doc is None:
+                with t.stage("open"):
+                    doc = stack.enter_context(opened_pdf(pdf))
+            return doc
+
+        # Publisher-embedded metadata (XMP / info dict) needs no page text;
+        # the fields it provides are not scanned for.
+        embedded, sources, created_year = {}, {}, None
+        if plan.needs("embedded"):
+            def read_embedded():
+                doc = get_doc()
+                with t.stage("embedded_metadata"):
+                    values, found = read_embedded_metadata(doc)
+                    created_year = read_created_year(doc)
+                log.debug("embedded metadata", extra={"file": file_path, "fields": ",".join(values)})
+                return {"values": values, "sources": found, "created_year": created_year}
+            out = run("embedded", read_embedded)
+            embedded, sources, created_year = out["values"], out["sources"], out["created_year"]
+
+        title_layout = None
+        if plan.needs("layout_title") and "title" not in embedded:
+            def read_layout_title():
+                doc = get_doc()
+                with t.stage("layout_title"):
+                    page1_dict = extract_first_page_dict(doc)
+                    title = extract_title_from_first_page_layout(page1_dict)
+                log.debug("layout title", extra={"file": file_path, "title": title})
+                return {"title": title}
+            title_layout = run("layout_title", read_layout_title)["title"]
+
+        pages_all, front = [], None
+
+        def front_pages() -> list[dict]:
+            # the front pages the metadata scan read, for triage and the LLM
+            nonlocal front
+            if front is None:
+                stored = pages_all or (cache.get("full_text") if cache is not None else MISSING)
+                if stored is not MISSING:
+                    front = [p for p in stored if p["page"] <= max_pages][:n_meta]
+                else:
+                    front = list(iter_page_texts(get_doc(), max_pages=n_meta))
+            return front
+
+        if plan.needs("metadata"):
+            # Metadata from the front pages, read one page at a time: later pages
+            # are only extracted while DOI, year, keywords or article type (or MeSH
+            # terms a page hinted at) are missing, up to max_pages. Stored page
+            # text is used if still valid.
+            def scan_metadata():
+                nonlocal front
+                stored = cache.get("full_text") if cache is not None else MISSING
+                if stored is not MISSING:
+                    pages = (p for p in stored if p["page"] <= max_pages)
+                else:
+                    pages = iter_page_texts(get_doc(), max_pages=max_pages)
+                with t.stage("metadata"):
+                    paper, read = scan_paper_metadata(
+                        pages, file_path=file_path, file_hash=file_hash, embedded=embedded, sources=sources,
+                        created_year=created_year,
+                    )
+                dump.debug("first pages text", extra={"file": file_path, "pages": len(read), "text": join_pages(read)[:500]})
+                front = read
+                if title_layout:
+                    paper["title"] = title_layout
+                    paper["metadata_sources"]["title"] = SOURCE_LAYOUT
+                paper = paper.to_dict()
+                del paper["file_path"], paper["file_hash"]
+                return {"paper": paper, "pages": len(read)}
+            # the scan reads page text, so a new text extraction version also redoes it
+            out = run("metadata", scan_metadata, {"max_pages": max_pages, "text": STAGE_VERSIONS["full_text"]})
+            meta = PaperRecord(file_path=file_path, file_hash=file_hash, **copy.deepcopy(out["paper"]))
+            n_meta = out["pages"]
+        else:
+            meta = PaperRecord(file_path=file_path, file_hash=file_hash)
+            n_meta = 0
+
+        if dedup is not None and plan.needs("dedup"):
+            def fingerprint():
+                pages = front_pages()
+                first_page = pages[0]["text"] if pages else ""
+                with t.stage("dedup"):
+                    kind = version_kind(first_page, meta.get("metadata_sources"))
+                    sig = minhash(first_page)
+                return {"kind": kind, "minhash": sig}
+            out = run("dedup", fingerprint)
+            meta["version_kind"] = out["kind"]
+            duplicate_of, supersedes = dedup.resolve(file_hash, meta.get("doi"), out["kind"], out["minhash"])
+            if duplicate_of:
+                log.debug("duplicate", extra={"file": file_path, "duplicate_of": duplicate_of})
+                meta["duplicate_of"] = duplicate_of
+                # linked to the canonical paper instead of extracted again
+                plan = StagePlan(frozenset({"metadata"}))
+                use_llm = False
+
+        if triage is not None and plan.needs("triage"):
+            def score_relevance():
+                text = join_pages(front_pages())
+                with t.stage("triage"):
+                    score, terms = relevance_score(meta.get("title"), meta.get("author_keywords"), text)
+                return {"score": score, "terms": terms}
+            out = run("triage", score_relevance)
+            meta["relevance_score"] = out["score"]
+            meta["triage"] = triage.decide(out["score"], file_path, file_hash, meta.get("doi"))
+            log.debug("triage", extra={"file": file_path, "score": out["score"], "terms": ",".join(out["terms"]),
+                                       "triage": meta["triage"]})
+            if meta["triage"] == TRIAGE_METADATA_ONLY:
+                # no full text, tables, characterization or LLM for this paper
+                plan = StagePlan(frozenset({"metadata"}))
+                use_llm = False
+
+        if plan.needs("full_text"):
+            def full_text():
+                doc = get_doc()
+                with t.stage("full_text"):
+                    return extract_pdf_text_all_pages(doc)
+            pages_all = run("full_text", full_text)
+        text_all_clean = None
+
+        def clean_text() -> str:
+            nonlocal text_all_clean
+            if text_all_clean is None:
+                text_all_clean = remove_references(join_pages(pages_all))
+            return text_all_clean
+
+        table_rows = []
+        if plan.needs("table_rows"):
+            def read_table_rows():
+                doc = get_doc()
+                with t.stage("table_rows"):
+                    return extract_table_rows(doc)
+            table_rows = run("table_rows", read_table_rows)
+
+        nano = NanomaterialRecord()
+        if plan.needs("nanomaterial"):
+            def identity():
+                with t.stage("nanomaterial"):
+                    return extract_nanomaterial_identity(text=clean_text(), characterization=False).to_dict()
+            nano = NanomaterialRecord(copy.deepcopy(run("nanomaterial", identity)))
+        if plan.needs("characterization"):
+            def characterization():
+                with t.stage("characterization"):
+                    values = dict(extract_characterization_regex(clean_text()))
+                    for k, v in parse_table_rows(table_rows).items():
+                        if v and not values.get(k):
+                            values[k] = v
+                return values
+            nano.update(copy.deepcopy(run("characterization", characterization)))
+
+        bio = BioEffectsRecord()
+        if plan.needs("bio_effects"):
+            def bio_effects():
+                with t.stage("bio_effects"):
+                    return extract_bio_effects(clean_text()).to_dict()
+            bio = BioEffectsRecord(copy.deepcopy(run("bio_effects", bio_effects)))
 
-        
         # Starting the LLM:
-        result_rules = {"paper": meta, "nanomaterial": nano, "bio_effects": bio}
-        result_rules["paper"]["extraction_method"] = "rules"
+        result_rules = ExtractionResult(meta, nano, bio)
+        result_rules.paper["extraction_method"] = "rules"
+        result_rules.paper["extractor_version"] = EXTRACTOR_VERSION
+        if plan.selected is not None:
+            result_rules.paper["stages"] = [s for s in OUTPUT_STAGES if s in plan.selected]
         result = result_rules
 
         if use_llm:
-            title_page_text = pages_meta[0]["text"] if pages_meta else text_meta
-            abstract_text = extract_abstract(text_meta)
-            keywords_hint = extract_keywords_hint(text_meta)
-            # nano_evidence = nano.get("evidence") or ""
-
-            patch, raw = refine_patch_with_ollama(
-                            draft_rules_result=result_rules,
-                            title_page_text=title_page_text,
-                            abstract_text=abstract_text,
-                            keywords_hint=keywords_hint,
-                            # nanomaterial_evidence=nano_evidence,
-                            descriptor_snippets=descriptor_snips,
-                            table_rows=table_rows,   # NEW
-                            model=llm_model,
-                        )
-            # Debug prints (optional)
-            print(f"Raw LLM output:\n{raw}\nParsed PATCH:\n{patch}")
+            def refine():
+                # imported here so runs without --llm never load requests
+                from extract.llm.ollama_client import refine_patch_with_ollama # This can be changed with any LLM client or stub
+
+                pages_meta = front_pages()
+                text_meta = join_pages(pages_meta)
+                title_page_text = pages_meta[0]["text"] if pages_meta else text_meta
+                abstract_text = extract_abstract(text_meta)
+                keywords_hint = extract_keywords_hint(text_meta)
+                # nano_evidence = nano.get("evidence") or ""
+
+                with t.stage("snippets"):
+                    descriptor_snips = extract_descriptor_snippets(clean_text())
+
+                with t.stage("llm"):
+                    patch, raw = refine_patch_with_ollama(
+                                    draft_rules_result=result_rules.to_dict(),
+                                    title_page_text=title_page_text,
+                                    abstract_text=abstract_text,
+                                    keywords_hint=keywords_hint,
+                                    # nanomaterial_evidence=nano_evidence,
+                                    descriptor_snippets=descriptor_snips,
+                                    table_rows=table_rows,   # NEW
+                                    model=llm_model,
+                                )
+                dump.debug("llm output", extra={"file": file_path, "raw": raw, "patch": patch})
+                return {"patch": patch}
+
+            # A stored patch is merged again onto the new rule results; the
+            # LLM only runs again when its own version or model changed.
+            patch = copy.deepcopy(run("llm", refine, {"model": llm_model}, deps=())["patch"])
+
+            if patch and plan.selected is not None:
+                # the LLM may not fill fields of stages that were not selected
+                patch = {
+                    section: {k: v for k, v in values.items() if plan.has_field(section, k)}
+                    for section, values in patch.items()
+                }
 
             if patch:
-                merged = merge_patch(result_rules, patch)
-                merged["paper"]["extraction_method"] = "hybrid_llm"
-                merged["paper"]["llm_model"] = llm_model
-                merged["paper"]["llm_status"] = "ok_patch_merged"
-                result = merged
+                # merged in place; the rules result is not kept separately
+                merge_patch(result, patch)
+                sources = result["paper"].get("metadata_sources")
+                if sources is not None:
+                    sources.update({k: SOURCE_LLM for k, v in (patch.get("paper") or {}).items() if v})
+                result["paper"]["extraction_method"] = "hybrid_llm"
+                result["paper"]["llm_model"] = llm_model
+                result["paper"]["llm_status"] = "ok_patch_merged"
             else:
                 result["paper"]["llm_model"] = llm_model
                 result["paper"]["llm_status"] = "no_patch_fallback_to_rules"
         else:
             result["paper"]["extraction_method"] = "rules"
 
+        result.stage_outputs = recomputed
+        result.supersedes = supersedes
 
-        print("SAVING TITLE:", result["paper"].get("title"))
-        print("LLM STATUS:", result["paper"].get("llm_status"))
-
-        # Save to SQLite or Excel
-        if conn:
-            upsert_paper_and_insert_nanomat(conn, result)
-        else:
-            excel_rows.append(flatten_for_excel(result))
+        log.debug("extracted", extra={
+            "file": file_path,
+            "title": result["paper"].get("title"),
+            "llm_status": result["paper"].get("llm_status"),
+            "recomputed": ",".join(recomputed),
+        })
 
-        print(f"Processed: {os.path.basename(pdf_path)}")
+    return result, pages_all
 
-    if conn:
-        conn.close()
-        print(f"Saved to SQLite: {sqlite_db_path}")
+def run_pipeline(
+    pdf_dir: str | None,
+    use_llm: bool,
+    llm_model: str,
+    sqlite_db_path: str | None,
+    excel_path: str | None,
+    max_pages: int = 3,
+    resume: bool = False,
+    parquet_path: str | None = None,
+    jsonl_path: str | None = None,
+    prefetch: int = 4,
+    write_queue_size: int = 16,
+    timings_path: str | None = None,
+    profile_slowest: int = 0,
+    profile_dir: str = "profiles",
+    regex_stats: bool = False,
+    recursive: bool = False,
+    include: list[str] | None = None,
+    exclude: list[str] | None = None,
+    symlinks: str = "files",
+    max_file_size: int | None = None,
+    manifest_path: str | None = None,
+    archives: bool = False,
+    shard: tuple[int, int] | None = None,
+    stages: list[str] | None = None,
+    fields: list[str] | None = None,
+    recompute: bool = False,
+    triage_threshold: int | None = None,
+    triage_keep_path: str | None = None,
+    dedup_threshold: float | None = None,
+):
+    """
+    Three stages connected by bounded queues:
+      reader thread (file bytes, `prefetch` ahead) -> extraction (this thread,
+      in-memory documents) -> writer thread (sole owner of all outputs).
+    Full queues block the upstream stage, so memory stays bounded.
+
+    Per-PDF stage timings go to `timings_path` (CSV or JSON lines) and a
+    summary is logged at the end. profile_slowest=N dumps cProfile stats
+    of the N slowest PDFs into `profile_dir`. regex_stats=True counts
+    calls, hits and time per extractor regex and logs a ranking.
+
+    PDFs come from `pdf_dir` (optionally `recursive`, filtered by include /
+    exclude globs, symlink policy and `max_file_size` bytes) or from the
+    paths listed in `manifest_path`; see extract.io.discovery. With
+    `archives`, zip and tar files found in `pdf_dir` are read member by
+    member (manifest entries always are); members are recorded as
+    "bundle.zip!paper.pdf" and hashed from the member bytes.
+
+    shard=(i, N) processes only the files whose relative path hashes to
+    shard i, so N nodes can split one corpus without coordinating; see
+    extract.pipeline.merge for combining their outputs.
+
+    `stages` / `fields` limit extraction to those output stages (or the
+    stages filling those fields) and their dependencies; see
+    extract.pipeline.plan. With SQLite, fields of other stages keep their
+    stored values.
+
+    With SQLite, stage outputs are stored per paper and a rerun only
+    recomputes the stages whose version (extract.extractors.STAGE_VERSIONS)
+    or params changed, and those reading their output; `recompute` ignores
+    the stored outputs.
+
+    triage_threshold=N scores each paper's title, keywords and abstract for
+    nanomaterial vocabulary and extracts only the metadata of papers below
+    N, except those listed (path, file hash or DOI per line) in
+    `triage_keep_path`; see extract.extractors.triage.
+
+    dedup_threshold=S links papers with the DOI, or a first-page MinHash
+    similarity of at least S, of an already extracted paper to it instead
+    of extracting them again; see extract.pipeline.dedup.
+    """
+    triage = None
+    if triage_threshold is not None:
+        triage = TriagePolicy.from_file(triage_threshold, triage_keep_path)
+    try:
+        plan = resolve_plan(stages, fields, use_llm=use_llm, triage=triage is not None,
+                            dedup=dedup_threshold is not None)
+    except ValueError as e:
+        raise SystemExit(f"--stages/--fields: {e}")
+    if plan.selected is not None:
+        log.info("selective run", extra={"stages": ",".join(sorted(plan.stages))})
+
+    if manifest_path:
+        pdfs = iter_manifest(manifest_path, max_size=max_file_size)
     else:
-        write_excel(excel_rows, excel_path)
-        print(f"Saved to Excel: {excel_path}")
-
-def flatten_for_excel(result: dict) -> dict:
-    paper = result.get("paper", {})
-    nano = result.get("nanomaterial", {})
-    bio = result.get("bio_effects", {})
-
-    def join_list(v):
-        if isinstance(v, list):
-            return "; ".join(str(x) for x in v)
-        return v
-
-    row = {
-        # --- paper ---
-        "file_path": paper.get("file_path"),
-        "file_hash": paper.get("file_hash"),
-        "title": paper.get("title"),
-        "year": paper.get("year"),
-        "doi": paper.get("doi"),
-        "source_url": paper.get("source_url"),
-        "extraction": paper.get("extraction_method"),
-        "article_type": paper.get("article_type"),
-        "author_keywords": paper.get("author_keywords"),
-        "mesh_keywords": paper.get("mesh_keywords"),
-
-        # --- nanomaterial (existing) ---
-        "nanoparticle_name": nano.get("nanoparticle_name"),
-        "core_compositions": join_list(nano.get("core_compositions")),
-        "nm_category": nano.get("nm_category"),
-        "physical_phase": nano.get("physical_phase"),
-        "crystallinity": nano.get("crystallinity"),
-
-        "particle_size": nano.get("particle_size"),
-        "zeta_potential": nano.get("zeta_potential"),
-        "morphology": nano.get("morphology"),
-        "pdi": nano.get("pdi"),
-
-        "cas_number": nano.get("cas_number"),
-        "catalog_or_batch": nano.get("catalog_or_batch"),
-        # "evidence": nano.get("evidence"),
-
-        # --- nanomaterial characterization sheet (NEW) ---
-        "crystal_phase": nano.get("crystal_phase"),
-        "purity_percent": nano.get("purity_percent"),
-        "impurities": nano.get("impurities"),
-        "supplier_manufacturer": nano.get("supplier_manufacturer"),
-        "address": nano.get("address"),
-        "supplier_code": nano.get("supplier_code"),
-        "batch_or_lot_no": nano.get("batch_or_lot_no"),
-
-        "nominal_diameter_nm": nano.get("nominal_diameter_nm"),
-        "nominal_length_micron": nano.get("nominal_length_micron"),
-        "nominal_specific_surface_area_m2_g": nano.get("nominal_specific_surface_area_m2_g"),
-
-        "dispersant": nano.get("dispersant"),
-
-        "tem_diameter_nm": nano.get("tem_diameter_nm"),
-        "tem_width_nm_median": nano.get("tem_width_nm_median"),
-        "tem_length_nm_median": nano.get("tem_length_nm_median"),
-        "no_of_walls": nano.get("no_of_walls"),
-
-        "bet_surface_area_m2_g": nano.get("bet_surface_area_m2_g"),
-
-        "dls_mean_diameter_water_nm": nano.get("dls_mean_diameter_water_nm"),
-        "pdi_water": nano.get("pdi_water"),
-        "dls_mean_diameter_medium_nm": nano.get("dls_mean_diameter_medium_nm"),
-        "pdi_medium": nano.get("pdi_medium"),
-
-        "zeta_potential_water_mV": nano.get("zeta_potential_water_mV"),
-        "zeta_potential_medium_mV": nano.get("zeta_potential_medium_mV"),
-
-        "description_of_dispersion": nano.get("description_of_dispersion"),
-        "endotoxins_EU_mg": nano.get("endotoxins_EU_mg"),
-
-        # --- bio effects ---
-        "cell_viability": bio.get("cell_viability"),
-        "ros": bio.get("ros"),
-        # "bio_evidence": bio.get("bio_evidence"),
-
-        # --- llm status ---
-        "llm_model": paper.get("llm_model"),
-        "llm_status": paper.get("llm_status"),
-    }
-    return row
+        pdfs = iter_pdfs(
+            pdf_dir, recursive=recursive, include=include, exclude=exclude,
+            symlinks=symlinks, max_size=max_file_size, archives=archives,
+        )
+    if shard:
+        root = os.path.dirname(os.path.abspath(manifest_path)) if manifest_path else pdf_dir
+        pdfs = in_shard(pdfs, root, *shard)
+    # Discovery is lazy (the reader thread walks the tree while extraction
+    # runs); only the first match is looked for up front.
+    first = next(pdfs, None)
+    if first is None and shard:
+        log.info("no PDFs in this shard", extra={"shard": f"{shard[0]}/{shard[1]}"})
+        return
+    if first is None:
+        raise SystemExit("No PDF files found in --manifest" if manifest_path else "No PDF files found in --pdf_dir")
+    pdfs = itertools.chain([first], pdfs)
+
+    outputs = Outputs(
+        sqlite_db_path=sqlite_db_path,
+        excel_path=excel_path,
+        parquet_path=parquet_path,
+        jsonl_path=jsonl_path,
+        resume=resume,
+    )
+
+    done_hashes = set()
+    if resume:
+        done_hashes = outputs.done_hashes()
+        log.info("resuming", extra={"already_written": len(done_hashes)})
+
+    # read side of the stage cache; the writer thread owns outputs.conn
+    cache_conn = None
+    if sqlite_db_path and not recompute:
+        cache_conn = init_sqlite(sqlite_db_path)
+
+    dedup = None
+    if dedup_threshold is not None:
+        dedup = DuplicateIndex(dedup_threshold)
+        if sqlite_db_path:
+            conn = cache_conn or init_sqlite(sqlite_db_path)
+            log.info("dedup index", extra={"canonical_papers": dedup.load(conn)})
+            if conn is not cache_conn:
+                conn.close()
+
+    read_q: queue.Queue = queue.Queue(maxsize=prefetch)
+    write_q: queue.Queue = queue.Queue(maxsize=write_queue_size)
+
+    report = RunReport(timings_path)
+    if regex_stats:
+        patterns.reset_stats()
+        patterns.enable_stats()
+    profiles = SlowestProfiles(profile_slowest) if profile_slowest > 0 else None
+
+    progress = Progress(logger=log)
+    triaged_out = duplicates = 0
+
+    def write_results():
+        for result, pages_all, timer in drain(write_q):
+            with timer.stage("write"):
+                outputs.write(result, pages_all)
+            report.add(result["paper"]["file_path"], timer.times)
+            progress.add(pages=len(pages_all))
+
+    def read_failed():
+        # an unreadable file still counts towards the total, as an error
+        progress.found()
+        progress.error()
+
+    def read_files():
+        # the progress total grows while discovery is still running
+        prefetch_files(pdfs, read_q, max_size=max_file_size, found=progress.found, failed=read_failed)
+        progress.found_all()
+
+    reader = Stage(read_files, name="pdf-reader")
+    writer = Stage(write_results, name="result-writer")
+    reader.start()
+    writer.start()
+
+    try:
+        for pdf_path, data in drain(read_q, reader):
+            timer = StageTimer()
+            with timer.stage("hash"):
+                file_hash = sha256_bytes(data)
+            if file_hash in done_hashes:
+                progress.skip()
+                continue
+
+            try:
+                cache = None
+                if cache_conn is not None:
+                    cache = StageCache(
+                        load_stage_results(cache_conn, file_hash),
+                        functools.partial(load_paper_pages, cache_conn, file_hash),
+                    )
+                with profiles.profile(pdf_path) if profiles else nullcontext():
+                    result, pages_all = process_pdf(
+                        data, pdf_path, file_hash,
+                        use_llm=use_llm, llm_model=llm_model, max_pages=max_pages,
+                        timer=timer, plan=plan, cache=cache, triage=triage, dedup=dedup,
+                    )
+            except Exception as e:
+                # One bad PDF should not end a long run; it is counted and logged.
+                log.error("extraction failed", extra={"file": pdf_path, "error": repr(e)},
+                          exc_info=log.isEnabledFor(logging.DEBUG))
+                progress.error()
+                if dedup is not None:
+                    dedup.discard()  # a failed paper must not become canonical
+                continue
+            if dedup is not None:
+                dedup.commit()
+            if result["paper"].get("triage") == TRIAGE_METADATA_ONLY:
+                triaged_out += 1
+            if result["paper"].get("duplicate_of"):
+                duplicates += 1
+            put(write_q, (result, pages_all, timer), writer)
+    finally:
+        # Let the writer drain what it has, then close the outputs so a
+        # partial run stays durable and resumable.
+        try:
+            put(write_q, DONE, writer)
+        except BaseException:
+            pass  # writer died; its error is raised below
+        writer.join()
+        outputs.close()
+        if cache_conn is not None:
+            cache_conn.close()
+        report.close()
+        if regex_stats:
+            patterns.disable_stats()
+
+    if writer.error:
+        raise writer.error
+
+    progress.log_line()
+    if triage:
+        log.info("triage", extra={"threshold": triage.threshold, "metadata_only": triaged_out})
+    if dedup:
+        log.info("dedup", extra={"threshold": dedup.threshold, "duplicates": duplicates})
+    log.info("%s", report.summary())
+    if timings_path:
+        log.info("saved", extra={"output": "timings", "path": timings_path})
+    if profiles:
+        for path in profiles.dump(profile_dir):
+            log.info("saved", extra={"output": "profile", "path": path})
+    if regex_stats:
+        log.info("Regex patterns by total time:\n%s", patterns.pattern_report())
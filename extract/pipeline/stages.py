@@ -0,0 +1,76 @@
+import queue
+import threading
+from typing import Callable, Iterable, Iterator
+
+from extract.io.archives import read_sources
+
+# End-of-stream marker passed through the queues
+DONE = object()
+
+
+class Stage(threading.Thread):
+    """
+    Background pipeline stage. An exception is kept on `.error` so the
+    thread that feeds or drains it can re-raise instead of blocking forever.
+    """
+
+    def __init__(self, fn: Callable[[], None], name: str):
+        super().__init__(name=name, daemon=True)
+        self._fn = fn
+        self.error: BaseException | None = None
+
+    def run(self):
+        try:
+            self._fn()
+        except BaseException as e:
+            self.error = e
+
+
+def put(q: queue.Queue, item, stage: Stage):
+    """
+    Blocking put on a bounded queue (backpressure) that gives up if the
+    consuming stage has died.
+    """
+    while True:
+        try:
+            q.put(item, timeout=0.5)
+            return
+        except queue.Full:
+            if stage.error:
+                raise stage.error
+
+def drain(q: queue.Queue, producer: Stage | None = None) -> Iterator:
+    """
+    Yields items from a queue until DONE, re-raising if the producing stage
+    (when it is a background Stage) dies.
+    """
+    while True:
+        try:
+            item = q.get(timeout=0.5)
+        except queue.Empty:
+            if producer is not None and producer.error:
+                raise producer.error
+            continue
+        if item is DONE:
+            return
+        yield item
+
+
+def prefetch_files(
+    paths: Iterable[str],
+    q: queue.Queue,
+    max_size: int | None = None,
+    found: Callable[[], None] | None = None,
+    failed: Callable[[], None] | None = None,
+):
+    """
+    Reader stage: loads file bytes ahead of the extraction stage. The bounded
+    queue caps how many files are held in memory. Archive paths are expanded
+    into their PDF members (see extract.io.archives); `found` is called once
+    per queued PDF and `failed` once per file or archive that could not be read.
+    """
+    for path, data in read_sources(paths, max_size=max_size, failed=failed):
+        if found:
+            found()
+        q.put((path, data))
+    q.put(DONE)
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import signal
+import threading
+import time
+
+from extract.utils.hashing import sha256_bytes
+from extract.pipeline.runner import process_pdf
+from extract.pipeline.outputs import Outputs
+
+log = logging.getLogger(__name__)
+
+
+class WatchCounters:
+    """
+    Files waiting to settle or be processed, and files processed, skipped
+    (content already stored) or failed since the watcher started.
+    """
+
+    def __init__(self):
+        self.queued = 0
+        self.done = 0
+        self.skipped = 0
+        self.failed = 0
+
+    def as_dict(self) -> dict:
+        return {"queued": self.queued, "done": self.done, "skipped": self.skipped, "failed": self.failed}
+
+
+def _snapshot(pdf_dir: str) -> dict[str, tuple[int, int]]:
+    # path -> (size, mtime_ns) for the PDFs directly in pdf_dir
+    snap = {}
+    with os.scandir(pdf_dir) as it:
+        for entry in it:
+            if entry.name.lower().endswith(".pdf") and entry.is_file():
+                st = entry.stat()
+                snap[entry.path] = (st.st_size, st.st_mtime_ns)
+    return snap
+
+
+class DirectoryPoller:
+    """
+    Reports PDFs that are new or changed since they were last reported.
+    A file is only reported once its size and mtime are unchanged between
+    two polls and its mtime is at least `settle` seconds old, so files that
+    are still being copied in are left alone.
+    """
+
+    def __init__(self, pdf_dir: str, settle: float = 2.0):
+        self.pdf_dir = pdf_dir
+        self.settle = settle
+        self.seen: dict[str, tuple[int, int]] = {}
+        self.pending: dict[str, tuple[int, int]] = {}
+
+    def poll(self) -> list[str]:
+        snap = _snapshot(self.pdf_dir)
+        now_ns = time.time_ns()
+        ready = []
+        for path, sig in snap.items():
+            if self.seen.get(path) == sig:
+                continue
+            size, mtime_ns = sig
+            if self.pending.get(path) == sig and size > 0 and now_ns - mtime_ns >= self.settle * 1e9:
+                ready.append(path)
+                self.seen[path] = sig
+                del self.pending[path]
+            else:
+                self.pending[path] = sig
+
+        # Deleted files are forgotten; if they come back they are new again
+        for d in (self.pending, self.seen):
+            for path in [p for p in d if p not in snap]:
+                del d[path]
+        return sorted(ready)
+
+
+def _write_status(path: str, counters: WatchCounters):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**counters.as_dict(), "updated": time.strftime("%Y-%m-%dT%H:%M:%S")}, f)
+    os.replace(tmp, path)
+
+
+def watch_directory(
+    pdf_dir: str,
+    sqlite_db_path: str,
+    use_llm: bool = False,
+    llm_model: str = "stub-model",
+    max_pages: int = 3,
+    jsonl_path: str | None = None,
+    interval: float = 5.0,
+    settle: float = 2.0,
+    status_path: str | None = None,
+    once: bool = False,
+    stop: threading.Event | None = None,
+) -> WatchCounters:
+    """
+    Keeps one warm process on `pdf_dir`: every `interval` seconds new or
+    changed PDFs that have settled are extracted into SQLite (and JSONL if
+    given). PDFs whose content is already stored are skipped. Counters are
+    logged after each batch and written to `status_path` as JSON if given.
+
+    Runs until SIGINT/SIGTERM or `stop` is set; once=True returns after the
+    files present at start have been processed.
+    """
+    stop = stop or threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    outputs = Outputs(sqlite_db_path=sqlite_db_path, jsonl_path=jsonl_path)
+    done_hashes = outputs.done_hashes()
+    poller = DirectoryPoller(pdf_dir, settle=settle)
+    counters = WatchCounters()
+    log.info("watching", extra={"dir": pdf_dir, "interval": interval, "already_stored": len(done_hashes)})
+
+    try:
+        while not stop.is_set():
+            ready = poller.poll()
+            counters.queued = len(poller.pending) + len(ready)
+
+            for path in ready:
+                if stop.is_set():
+                    break
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    file_hash = sha256_bytes(data)
+                    if file_hash in done_hashes:
+                        counters.skipped += 1
+                    else:
+                        result, pages_all = process_pdf(
+                            data, path, file_hash,
+                            use_llm=use_llm, llm_model=llm_model, max_pages=max_pages,
+                        )
+                        outputs.write(result, pages_all)
+                        done_hashes.add(file_hash)
+                        counters.done += 1
+                except Exception as e:
+                    log.error("extraction failed", extra={"file": path, "error": repr(e)},
+                              exc_info=log.isEnabledFor(logging.DEBUG))
+                    counters.failed += 1
+                counters.queued -= 1
+
+            if ready:
+                log.info("batch", extra={"files": len(ready), **counters.as_dict()})
+            if status_path:
+                _write_status(status_path, counters)
+            if once and not poller.pending:
+                break
+            stop.wait(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        outputs.close()
+        log.info("stopped", extra=counters.as_dict())
+    return counters
@@ -0,0 +1,322 @@
+import json
+
+# Result record types and the single definition of their fields.
+#
+# A result is an ExtractionResult holding a PaperRecord, a NanomaterialRecord
+# and a BioEffectsRecord. The records use __slots__ (no per-instance dict) and
+# behave like the dicts they replace: rec["doi"], rec.get("doi"), rec.update(),
+# so writers work the same on records and on results read back from JSONL.
+#
+# The Field lists below are the only place fields are declared. The LLM patch
+# whitelists, the Excel columns and NANOMATERIAL_DEFAULTS are derived from them.
+
+_UNSET = object()
+
+
+class Field:
+    """
+    One record field. `default` is set on every new record (lists are
+    copied); fields without one are absent until assigned. `llm` allows LLM
+    patches to set the field. `excel` is the Excel column name (True: same
+    as the field, False: not exported); `excel_last` moves the column after
+    all other records' columns. `stage` is the extraction stage that fills
+    the field (see extract.pipeline.plan); None for bookkeeping fields.
+    """
+
+    __slots__ = ("name", "default", "llm", "excel", "excel_last", "stage")
+
+    def __init__(self, name: str, default=_UNSET, llm: bool = False,
+                 excel: bool | str = True, excel_last: bool = False, stage: str | None = None):
+        self.name = name
+        self.default = default
+        self.llm = llm
+        self.excel = name if excel is True else excel
+        self.excel_last = excel_last
+        self.stage = stage
+
+
+PAPER_FIELDS = [
+    Field("file_path"),
+    Field("file_hash"),
+    Field("title", llm=True, stage="metadata"),
+    Field("year", llm=True, stage="metadata"),
+    Field("doi", llm=True, stage="metadata"),
+    Field("source_url", llm=True, stage="metadata"),
+    Field("extraction_method", excel="extraction"),
+    Field("article_type", llm=True, stage="metadata"),
+    Field("author_keywords", llm=True, stage="metadata"),
+    Field("mesh_keywords", llm=True, stage="metadata"),
+    Field("llm_model", excel_last=True),
+    Field("llm_status", excel_last=True),
+    Field("extractor_version", excel_last=True),
+    # field -> "xmp" | "info" | "layout" | "text" | "llm"
+    Field("metadata_sources", excel=False, stage="metadata"),
+    # extraction stages this result was limited to (selective runs only)
+    Field("stages", excel=False),
+    # relevance triage (--triage): score and relevant | kept | metadata_only
+    Field("relevance_score", excel_last=True),
+    Field("triage", excel_last=True),
+    # near-duplicate check (--dedup): preprint | accepted | publisher | unknown,
+    # and the file hash of the canonical paper this one duplicates
+    Field("version_kind", excel_last=True),
+    Field("duplicate_of", excel_last=True),
+]
+
+NANOMATERIAL_FIELDS = [
+    # identity
+    Field("nanoparticle_name", None, stage="nanomaterial"),
+    Field("core_compositions", [], llm=True, stage="nanomaterial"),
+    Field("nm_category", None, llm=True, stage="nanomaterial"),
+    Field("physical_phase", None, llm=True, stage="nanomaterial"),
+    Field("crystallinity", None, llm=True, stage="nanomaterial"),
+
+    # descriptors
+    Field("particle_size", None, stage="characterization"),
+    Field("zeta_potential", None, stage="characterization"),
+    Field("morphology", None, stage="characterization"),
+    Field("pdi", None, stage="characterization"),
+
+    Field("cas_number", None, llm=True, stage="nanomaterial"),
+    Field("catalog_or_batch", None, llm=True, stage="nanomaterial"),
+
+    # characterization-sheet fields
+    Field("crystal_phase", None, stage="characterization"),
+    Field("purity_percent", None, llm=True, stage="characterization"),
+    Field("impurities", None, llm=True, stage="characterization"),
+    Field("supplier_manufacturer", None, llm=True, stage="characterization"),
+    Field("address", None, llm=True, stage="characterization"),
+    Field("supplier_code", None, llm=True, stage="characterization"),
+    Field("batch_or_lot_no", None, llm=True, stage="characterization"),
+    Field("nominal_diameter_nm", None, llm=True, stage="characterization"),
+    Field("nominal_length_micron", None, llm=True, stage="characterization"),
+    Field("nominal_specific_surface_area_m2_g", None, llm=True, stage="characterization"),
+    Field("dispersant", None, llm=True, stage="characterization"),
+    Field("tem_diameter_nm", None, llm=True, stage="characterization"),
+    Field("tem_width_nm_median", None, llm=True, stage="characterization"),
+    Field("tem_length_nm_median", None, llm=True, stage="characterization"),
+    Field("no_of_walls", None, llm=True, stage="characterization"),
+    Field("bet_surface_area_m2_g", None, llm=True, stage="characterization"),
+    Field("dls_mean_diameter_water_nm", None, llm=True, stage="characterization"),
+    Field("pdi_water", None, llm=True, stage="characterization"),
+    Field("dls_mean_diameter_medium_nm", None, llm=True, stage="characterization"),
+    Field("pdi_medium", None, llm=True, stage="characterization"),
+    Field("zeta_potential_water_mV", None, llm=True, stage="characterization"),
+    Field("zeta_potential_medium_mV", None, llm=True, stage="characterization"),
+    Field("description_of_dispersion", None, llm=True, stage="characterization"),
+    Field("endotoxins_EU_mg", None, llm=True, stage="characterization"),
+]
+
+BIO_EFFECTS_FIELDS = [
+    Field("cell_viability", None, stage="bio_effects"),
+    Field("ros", None, stage="bio_effects"),
+    Field("bio_evidence", None, excel=False, stage="bio_effects"),
+]
+
+
+class Record:
+    """
+    Base for the slotted, dict-like result records.
+    """
+
+    __slots__ = ()
+    FIELDS: list[Field] = []
+    _NAMES: frozenset = frozenset()
+    _DEFAULTS: list[tuple] = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._NAMES = frozenset(f.name for f in cls.FIELDS)
+        cls._DEFAULTS = [(f.name, f.default) for f in cls.FIELDS if f.default is not _UNSET]
+
+    def __init__(self, values: dict | None = None, **kw):
+        for name, default in self._DEFAULTS:
+            setattr(self, name, list(default) if isinstance(default, list) else default)
+        if values:
+            self.update(values)
+        if kw:
+            self.update(kw)
+
+    @classmethod
+    def defaults(cls) -> dict:
+        return {name: default for name, default in cls._DEFAULTS}
+
+    @classmethod
+    def llm_fields(cls) -> set[str]:
+        return {f.name for f in cls.FIELDS if f.llm}
+
+    # --- dict protocol ---
+    def __getitem__(self, key: str):
+        if key in self._NAMES:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                pass
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self._NAMES:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}")
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in self._NAMES and hasattr(self, key)
+
+    def get(self, key: str, default=None):
+        if key in self._NAMES:
+            return getattr(self, key, default)
+        return default
+
+    def update(self, values: dict):
+        for k, v in values.items():
+            self[k] = v
+
+    def keys(self) -> list[str]:
+        return [f.name for f in self.FIELDS if hasattr(self, f.name)]
+
+    def items(self) -> list[tuple]:
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def to_dict(self) -> dict:
+        """
+        Plain dict of the fields that are set.
+        """
+        d = {}
+        for f in self.FIELDS:
+            try:
+                d[f.name] = getattr(self, f.name)
+            except AttributeError:
+                pass
+        return d
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _slots(fields: list[Field]) -> tuple:
+    return tuple(f.name for f in fields)
+
+
+class PaperRecord(Record):
+    __slots__ = _slots(PAPER_FIELDS)
+    FIELDS = PAPER_FIELDS
+
+
+class NanomaterialRecord(Record):
+    __slots__ = _slots(NANOMATERIAL_FIELDS)
+    FIELDS = NANOMATERIAL_FIELDS
+
+
+class BioEffectsRecord(Record):
+    __slots__ = _slots(BIO_EFFECTS_FIELDS)
+    FIELDS = BIO_EFFECTS_FIELDS
+
+
+# section -> record type, in output order
+SECTIONS = {"paper": PaperRecord, "nanomaterial": NanomaterialRecord, "bio_effects": BioEffectsRecord}
+
+# (section, field, column) in Excel column order
+_EXCEL_LAYOUT = [
+    (section, f.name, f.excel)
+    for last in (False, True)
+    for section, cls in SECTIONS.items()
+    for f in cls.FIELDS
+    if f.excel and f.excel_last == last
+]
+EXCEL_COLUMNS = [col for _, _, col in _EXCEL_LAYOUT]
+_LIST_FIELDS = {
+    (section, f.name) for section, cls in SECTIONS.items() for f in cls.FIELDS if isinstance(f.default, list)
+}
+
+
+def json_default(obj):
+    # json.dumps(default=...) hook: records become dicts, anything else a string
+    if isinstance(obj, (Record, ExtractionResult)):
+        return obj.to_dict()
+    return str(obj)
+
+
+def from_excel_row(row: dict) -> "ExtractionResult":
+    """
+    Inverse of to_excel_row, for flat rows read back from Parquet: "; "-joined
+    list fields (core_compositions) are split again.
+    """
+    sections: dict[str, dict] = {s: {} for s in SECTIONS}
+    for section, name, col in _EXCEL_LAYOUT:
+        v = row.get(col)
+        if v is None:
+            continue
+        if (section, name) in _LIST_FIELDS and isinstance(v, str):
+            v = [x for x in v.split("; ") if x]
+        sections[section][name] = v
+    return ExtractionResult.from_dict(sections)
+
+
+def to_excel_row(result) -> dict:
+    """
+    One Excel row from an ExtractionResult or a plain result dict (as read
+    back from JSONL). Lists are joined with "; ".
+    """
+    sections = {s: result.get(s) or {} for s in SECTIONS}
+    row = {}
+    for section, name, col in _EXCEL_LAYOUT:
+        v = sections[section].get(name)
+        row[col] = "; ".join(str(x) for x in v) if isinstance(v, list) else v
+    return row
+
+
+class ExtractionResult:
+    """
+    The {paper, nanomaterial, bio_effects} result of one PDF.
+    `stage_outputs` holds the outputs of the stages recomputed for it,
+    {stage: (version, params, output)}; it is stored with the paper but is
+    not part of the result. `supersedes` is the file hash of a canonical
+    paper this one replaces (extract.pipeline.dedup).
+    """
+
+    __slots__ = ("paper", "nanomaterial", "bio_effects", "stage_outputs", "supersedes")
+
+    def __init__(self, paper: PaperRecord, nanomaterial: NanomaterialRecord, bio_effects: BioEffectsRecord):
+        self.paper = paper
+        self.nanomaterial = nanomaterial
+        self.bio_effects = bio_effects
+        self.stage_outputs: dict | None = None
+        self.supersedes: str | None = None
+
+    @classmethod
+    def from_dict(cls, result: dict) -> "ExtractionResult":
+        # unknown keys (e.g. from older JSONL streams) are dropped
+        return cls(*(
+            rec_cls({k: v for k, v in (result.get(s) or {}).items() if k in rec_cls._NAMES})
+            for s, rec_cls in SECTIONS.items()
+        ))
+
+    def __getitem__(self, key: str):
+        if key in SECTIONS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in SECTIONS else default
+
+    def items(self) -> list[tuple]:
+        return [(s, getattr(self, s)) for s in SECTIONS]
+
+    def to_dict(self) -> dict:
+        return {s: getattr(self, s).to_dict() for s in SECTIONS}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str)
+
+    def to_row(self) -> dict:
+        return to_excel_row(self)
+
+    def __repr__(self):
+        return f"ExtractionResult({self.paper.get('file_path')!r})"
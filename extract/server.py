@@ -0,0 +1,302 @@
+import json
+import logging
+import os
+import queue
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from extract.api import ExtractOptions, extract_document
+
+log = logging.getLogger(__name__)
+
+# Local HTTP extraction service.
+#
+#   POST /extract   body: PDF bytes        -> {paper, nanomaterial, bio_effects}
+#   GET  /metrics   latency / throughput   -> JSON
+#   GET  /health                           -> {"status": "ok"}
+#
+# Request threads only enqueue jobs on a bounded queue (429 when it is full).
+# One dispatcher thread per worker process hands jobs to the process pool, so
+# at most `workers` PDFs are extracted at once and `queue_size` more wait.
+
+
+def _warm():
+    # Process pool initializer: load PyMuPDF before the first request
+    import fitz  # noqa: F401
+
+
+def _extract_bytes(data: bytes, file_name: str, options) -> dict:
+    # Runs in a worker process; the document is opened from memory
+    return extract_document(data, options, name=file_name).to_dict()
+
+
+class Metrics:
+    """
+    Request counters plus latency percentiles over the last `window` requests
+    and throughput over the last minute.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.started = time.monotonic()
+        self.counts = {"ok": 0, "failed": 0, "rejected": 0, "bad_request": 0}
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.finished: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def count(self, outcome: str):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def done(self, latency: float, ok: bool):
+        now = time.monotonic()
+        with self._lock:
+            self.counts["ok" if ok else "failed"] += 1
+            self.latencies.append(latency)
+            self.finished.append(now)
+
+    def snapshot(self, queued: int, in_flight: int) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            while self.finished and now - self.finished[0] > 60:
+                self.finished.popleft()
+            lat = sorted(self.latencies)
+            last_minute = len(self.finished)
+            counts = dict(self.counts)
+
+        def pct(q):
+            return round(lat[min(len(lat) - 1, int(q / 100 * len(lat)))] * 1000, 1) if lat else None
+
+        uptime = now - self.started
+        return {
+            "uptime_s": round(uptime, 1),
+            "requests": counts,
+            "queued": queued,
+            "in_flight": in_flight,
+            "latency_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99), "max": pct(100)},
+            "throughput_per_s": {
+                "last_minute": round(last_minute / min(60.0, uptime or 1e-9), 2),
+                "since_start": round((counts["ok"] + counts["failed"]) / (uptime or 1e-9), 2),
+            },
+        }
+
+
+class _Job:
+    __slots__ = ("data", "file_name", "max_pages", "enqueued", "done", "result", "error")
+
+    def __init__(self, data: bytes, file_name: str, max_pages: int):
+        self.data = data
+        self.file_name = file_name
+        self.max_pages = max_pages
+        self.enqueued = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ExtractionService:
+    """
+    Bounded job queue in front of a process pool.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int = 32,
+        use_llm: bool = False,
+        llm_model: str = "stub-model",
+        max_pages: int = 3,
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.options = ExtractOptions(use_llm=use_llm, llm_model=llm_model, max_pages=max_pages)
+        self.metrics = Metrics()
+        self.jobs: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self.pool = self._new_pool()
+        self._dispatchers = [
+            threading.Thread(target=self._dispatch, name=f"dispatch-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._dispatchers:
+            t.start()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor):
+        # A worker that died (segfault / OOM in fitz) breaks the whole pool;
+        # the first dispatcher to notice replaces it, the jobs it held fail.
+        with self._lock:
+            if self.pool is not broken:
+                return
+            self.pool = self._new_pool()
+        log.error("worker process died, process pool recreated")
+        broken.shutdown(wait=False)
+
+    def _dispatch(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            with self._lock:
+                self.in_flight += 1
+            try:
+                options = self.options
+                if job.max_pages != options.max_pages:
+                    options = ExtractOptions(options.use_llm, options.llm_model, job.max_pages,
+                                             stages=options.stages, fields=options.fields,
+                                             triage_threshold=options.triage_threshold)
+                pool = self.pool
+                job.result = pool.submit(_extract_bytes, job.data, job.file_name, options).result()
+            except BrokenProcessPool as e:
+                job.error = e
+                self._replace_pool(pool)
+            except Exception as e:
+                job.error = e
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+                self.metrics.done(time.monotonic() - job.enqueued, ok=job.error is None)
+                job.done.set()
+
+    def submit(self, data: bytes, file_name: str, max_pages: int | None = None) -> _Job | None:
+        """
+        Queue one PDF; None if the queue is full.
+        """
+        job = _Job(data, file_name, max_pages or self.options.max_pages)
+        try:
+            self.jobs.put_nowait(job)
+        except queue.Full:
+            self.metrics.count("rejected")
+            return None
+        return job
+
+    def metrics_snapshot(self) -> dict:
+        with self._lock:
+            in_flight = self.in_flight
+        return self.metrics.snapshot(queued=self.jobs.qsize(), in_flight=in_flight)
+
+    def close(self):
+        for _ in self._dispatchers:
+            self.jobs.put(None)
+        for t in self._dispatchers:
+            t.join()
+        self.pool.shutdown()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: ExtractionService  # set on the subclass made by make_server()
+    max_bytes: int
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, obj: dict, headers: dict | None = None):
+        body = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/metrics":
+            self._send_json(200, self.service.metrics_snapshot())
+        elif path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/extract":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self.service.metrics.count("bad_request")
+            self.close_connection = True
+            self._send_json(400, {"error": "Content-Length must be an integer"})
+            return
+        if length <= 0:
+            self.service.metrics.count("bad_request")
+            self._send_json(400, {"error": "send the PDF bytes as the request body"})
+            return
+        if length > self.max_bytes:
+            self.service.metrics.count("bad_request")
+            self.close_connection = True
+            self._send_json(413, {"error": f"PDF larger than {self.max_bytes} bytes"})
+            return
+        data = self.rfile.read(length)
+
+        params = parse_qs(url.query)
+        file_name = params.get("file_name", ["upload.pdf"])[0]
+        try:
+            max_pages = int(params["max_pages"][0]) if "max_pages" in params else None
+        except ValueError:
+            self.service.metrics.count("bad_request")
+            self._send_json(400, {"error": "max_pages must be an integer"})
+            return
+
+        job = self.service.submit(data, file_name, max_pages)
+        if job is None:
+            self._send_json(429, {"error": "queue full, retry later"}, headers={"Retry-After": "1"})
+            return
+        job.done.wait()
+        if job.error is not None:
+            self._send_json(422, {"error": repr(job.error)})
+            return
+        self._send_json(200, job.result)
+
+    def log_message(self, fmt, *args):
+        log.debug("http " + fmt, *args)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # listen() backlog; the default of 5 resets connections under load tests
+    request_queue_size = 256
+
+
+def make_server(host: str, port: int, service: ExtractionService, max_bytes: int = 100 * 1024 * 1024) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"service": service, "max_bytes": max_bytes})
+    server = _Server((host, port), handler)
+    return server
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    workers: int | None = None,
+    queue_size: int = 32,
+    use_llm: bool = False,
+    llm_model: str = "stub-model",
+    max_pages: int = 3,
+):
+    """
+    Run the extraction service until interrupted.
+    """
+    service = ExtractionService(
+        workers=workers, queue_size=queue_size, use_llm=use_llm, llm_model=llm_model, max_pages=max_pages,
+    )
+    server = make_server(host, port, service)
+    # shutdown() blocks until serve_forever returns, so call it from another thread
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    log.info("serving", extra={"url": f"http://{host}:{server.server_port}", "workers": service.workers, "queue": queue_size})
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        log.info("stopped", extra=service.metrics_snapshot()["requests"])
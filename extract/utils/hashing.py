@@ -1,4 +1,7 @@
 import hashlib
+import json
+
+from extract.records import json_default
 
 def sha256_file(path: str) -> str:
     h = hashlib.sha256()
@@ -6,3 +9,14 @@ def sha256_file(path: str) -> str:
         for chunk in iter(lambda: f.read(1024 * 1024), b""):
             h.update(chunk)
     return h.hexdigest()
+
+def sha256_record(record) -> str:
+    """
+    Stable content hash of an extracted result, dict or records (key order
+    independent).
+    """
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=json_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,125 @@
+import json
+import logging
+import sys
+import threading
+import time
+
+# Large per-paper dumps (page text, raw LLM output) go to this logger and
+# stay off unless explicitly requested.
+DUMP_LOGGER = "extract.dump"
+
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_STD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+def _extras(record: logging.LogRecord) -> dict:
+    return {k: v for k, v in vars(record).items() if k not in _STD_ATTRS}
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        extras = _extras(record)
+        if extras:
+            line += " " + " ".join(f"{k}={v}" for k, v in extras.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        obj = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        obj.update(_extras(record))
+        if record.exc_info:
+            obj["exc"] = self.formatException(record.exc_info)
+        return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+def setup_logging(level: str = "INFO", fmt: str = "text", debug_dumps: bool = False):
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    root = logging.getLogger("extract")
+    root.handlers[:] = [handler]
+    root.setLevel(level.upper())
+    root.propagate = False
+
+    logging.getLogger(DUMP_LOGGER).setLevel(logging.DEBUG if debug_dumps else logging.WARNING)
+
+
+def _fmt_duration(seconds: float) -> str:
+    s = int(seconds)
+    return f"{s // 3600}:{s % 3600 // 60:02d}:{s % 60:02d}"
+
+
+class Progress:
+    """
+    Throughput tracker that logs one compact line at most every `interval`
+    seconds: done/total, PDFs/s, pages/s, ETA and error count. Safe to
+    update from the extraction and writer threads. Without a `total`, it
+    grows with found() while files are discovered (shown as "N+", no ETA)
+    until found_all().
+    """
+
+    def __init__(self, total: int | None = None, logger: logging.Logger | None = None, interval: float = 10.0):
+        self.total = total or 0
+        self.total_known = total is not None
+        self.log = logger
+        self.interval = interval
+        self.done = 0
+        self.pages = 0
+        self.errors = 0
+        self.skipped = 0
+        self.started = time.perf_counter()
+        self._last = self.started
+        self._lock = threading.Lock()
+
+    def add(self, pages: int = 0):
+        with self._lock:
+            self.done += 1
+            self.pages += pages
+        self._maybe_log()
+
+    def error(self):
+        with self._lock:
+            self.errors += 1
+        self._maybe_log()
+
+    def skip(self):
+        with self._lock:
+            self.skipped += 1
+
+    def found(self, n: int = 1):
+        with self._lock:
+            self.total += n
+
+    def found_all(self):
+        self.total_known = True
+
+    def _maybe_log(self):
+        now = time.perf_counter()
+        with self._lock:
+            if now - self._last < self.interval:
+                return
+            self._last = now
+        self.log_line()
+
+    def log_line(self):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        rate = self.done / elapsed
+        remaining = self.total - self.done - self.errors - self.skipped
+        eta = _fmt_duration(remaining / rate) if rate and self.total_known else "?"
+        self.log.info("progress", extra={
+            "done": self.done + self.errors + self.skipped,
+            "total": self.total if self.total_known else f"{self.total}+",
+            "pdfs_per_s": round(rate, 2),
+            "pages_per_s": round(self.pages / elapsed, 1),
+            "eta": eta,
+            "errors": self.errors,
+        })
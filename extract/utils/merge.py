@@ -12,18 +12,18 @@ def _is_empty(v: Any) -> bool:
         return True
     return False
 
-def merge_patch(base: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+def merge_patch(base, patch: Dict[str, Any]):
     """
-    Merge patch into base. Only overwrite when patch value is non-empty.
-    Supports nested dicts.
+    Merge patch into base in place and return base. Only overwrite when
+    patch value is non-empty. Supports nested dicts and result records
+    (nothing is copied).
     """
-    out = dict(base)
     for k, pv in patch.items():
-        bv = out.get(k)
+        bv = base.get(k)
 
-        if isinstance(bv, dict) and isinstance(pv, dict):
-            out[k] = merge_patch(bv, pv)
+        if isinstance(pv, dict) and hasattr(bv, "items"):
+            merge_patch(bv, pv)
         else:
             if not _is_empty(pv):
-                out[k] = pv
-    return out
+                base[k] = pv
+    return base
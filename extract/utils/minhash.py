@@ -0,0 +1,54 @@
+import hashlib
+import random
+import re
+
+from extract.utils.patterns import register_patterns
+
+# MinHash signatures of word shingles, for finding near-identical texts
+# (a preprint and the published version of one paper) without comparing
+# every pair: signatures that agree on a whole LSH band are candidates, and
+# the fraction of agreeing positions estimates their Jaccard similarity.
+
+NUM_PERM = 64
+BANDS = 16          # 16 bands of 4 rows: pairs above ~0.5 similarity usually share a band
+SHINGLE_WORDS = 3
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)  # fixed seed: signatures must be comparable across runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, k: int = SHINGLE_WORDS) -> set[str]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def minhash(text: str) -> list[int] | None:
+    """
+    NUM_PERM-value signature of the text's word shingles, or None if the
+    text has no words.
+    """
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+        for s in shingles(text)
+    ]
+    if not hashes:
+        return None
+    return [min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS]
+
+
+def similarity(sig_a: list[int], sig_b: list[int]) -> float:
+    # estimated Jaccard similarity of the two shingle sets
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def band_keys(sig: list[int]) -> list[tuple]:
+    rows = len(sig) // BANDS
+    return [(i, tuple(sig[i * rows:(i + 1) * rows])) for i in range(BANDS)]
+
+
+register_patterns(__name__)
@@ -0,0 +1,166 @@
+import re
+import sys
+import time
+
+# Registry of the extractors' module-level compiled regexes.
+#
+# Modules call register_patterns(__name__) once at the bottom. While stats are
+# disabled (the default) nothing is wrapped, so matching costs exactly what a
+# plain re.Pattern costs. enable_stats() swaps every registered pattern for an
+# instrumented wrapper that counts calls, hits, characters scanned and time;
+# disable_stats() puts the originals back.
+
+# name -> (container, key, original pattern); container is a module, list or dict
+_REGISTRY: dict[str, tuple[object, object, re.Pattern]] = {}
+_STATS: dict[str, "PatternStats"] = {}
+_enabled = False
+
+
+class PatternStats:
+    __slots__ = ("pattern", "calls", "hits", "chars", "seconds")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.calls = 0
+        self.hits = 0
+        self.chars = 0
+        self.seconds = 0.0
+
+
+class InstrumentedPattern:
+    """
+    Drop-in stand-in for re.Pattern that records PatternStats.
+    """
+
+    def __init__(self, rx: re.Pattern, stats: PatternStats):
+        self._rx = rx
+        self._stats = stats
+        self.pattern = rx.pattern
+        self.flags = rx.flags
+        self.groups = rx.groups
+
+    def _timed(self, fn, string, *args, **kwargs):
+        st = self._stats
+        t0 = time.perf_counter()
+        out = fn(string, *args, **kwargs)
+        st.seconds += time.perf_counter() - t0
+        st.calls += 1
+        st.chars += len(string)
+        if out:
+            st.hits += 1
+        return out
+
+    def search(self, string, *args, **kwargs):
+        return self._timed(self._rx.search, string, *args, **kwargs)
+
+    def match(self, string, *args, **kwargs):
+        return self._timed(self._rx.match, string, *args, **kwargs)
+
+    def fullmatch(self, string, *args, **kwargs):
+        return self._timed(self._rx.fullmatch, string, *args, **kwargs)
+
+    def findall(self, string, *args, **kwargs):
+        return self._timed(self._rx.findall, string, *args, **kwargs)
+
+    def split(self, string, *args, **kwargs):
+        return self._timed(self._rx.split, string, *args, **kwargs)
+
+    def sub(self, repl, string, *args, **kwargs):
+        return self._timed(lambda s: self._rx.sub(repl, s, *args, **kwargs), string)
+
+    def finditer(self, string, *args, **kwargs):
+        # Lazy: time is charged while the caller iterates.
+        st = self._stats
+        st.calls += 1
+        st.chars += len(string)
+        it = self._rx.finditer(string, *args, **kwargs)
+        found = False
+        while True:
+            t0 = time.perf_counter()
+            m = next(it, None)
+            st.seconds += time.perf_counter() - t0
+            if m is None:
+                return
+            if not found:
+                found = True
+                st.hits += 1
+            yield m
+
+
+def _set(container, key, value):
+    if isinstance(container, (list, dict)):
+        container[key] = value
+    else:
+        setattr(container, key, value)
+
+def register_patterns(module_name: str):
+    """
+    Register the module's compiled patterns: module-level re.Pattern
+    attributes and lists / dicts of them.
+    """
+    module = sys.modules[module_name]
+    short = module_name.rsplit(".", 1)[-1]
+    for attr, value in list(vars(module).items()):
+        if isinstance(value, re.Pattern):
+            entries = [(f"{short}.{attr}", module, attr, value)]
+        elif isinstance(value, list):
+            entries = [(f"{short}.{attr}[{v.pattern}]", value, i, v) for i, v in enumerate(value) if isinstance(v, re.Pattern)]
+        elif isinstance(value, dict):
+            entries = [(f"{short}.{attr}[{k}]", value, k, v) for k, v in value.items() if isinstance(v, re.Pattern)]
+        else:
+            continue
+        for name, container, key, rx in entries:
+            _REGISTRY[name] = (container, key, rx)
+            if _enabled:
+                _wrap(name)
+
+def _wrap(name: str):
+    container, key, rx = _REGISTRY[name]
+    stats = _STATS.setdefault(name, PatternStats(rx.pattern))
+    _set(container, key, InstrumentedPattern(rx, stats))
+
+def enable_stats():
+    global _enabled
+    _enabled = True
+    for name in _REGISTRY:
+        _wrap(name)
+
+def disable_stats():
+    global _enabled
+    _enabled = False
+    for container, key, rx in _REGISTRY.values():
+        _set(container, key, rx)
+
+def reset_stats():
+    _STATS.clear()
+    if _enabled:
+        enable_stats()
+
+def pattern_report(top: int | None = None) -> str:
+    """
+    Patterns ranked by total time spent in them over the run (costliest
+    first, patterns only ever called on empty text last), with seconds per
+    MB of text scanned, followed by the patterns that never matched or were
+    never called.
+    """
+    rows = [(name, st) for name, st in _STATS.items() if st.calls]
+    # per-MB cost is noise on a few short strings; the total is what the corpus pays
+    rows.sort(key=lambda r: (r[1].chars == 0, -r[1].seconds))
+    if top:
+        rows = rows[:top]
+
+    lines = [f"{'pattern':<44}{'calls':>8}{'hits':>8}{'hit%':>6}{'total ms':>10}{'s/MB':>9}"]
+    for name, st in rows:
+        mb = st.chars / 1e6
+        lines.append(
+            f"{name:<44}{st.calls:>8}{st.hits:>8}{st.hits / st.calls:>6.0%}"
+            f"{st.seconds * 1000:>10.1f}{(st.seconds / mb if mb else 0):>9.3f}"
+        )
+
+    never = sorted(name for name, st in _STATS.items() if st.calls and not st.hits)
+    if never:
+        lines.append("Never matched: " + ", ".join(never))
+    unused = sorted(name for name in _REGISTRY if not _STATS.get(name) or not _STATS[name].calls)
+    if unused:
+        lines.append("Never called: " + ", ".join(unused))
+    return "\n".join(lines)
@@ -1,5 +1,7 @@
 import re
 
+from extract.utils.patterns import register_patterns
+
 ABSTRACT_RE = re.compile(
     r"\babstract\b(.*?)(\bkeywords?\b|\bkey\s*words\b|\n[A-Z][A-Z ]{3,}\n)",
     re.I | re.S
@@ -25,3 +27,48 @@ def extract_keywords_hint(text: str) -> str:
     if not m:
         return ""
     return re.sub(r"\s+", " ", m.group(2)).strip()
+
+# Standalone section heading lines, optionally numbered ("2. Materials and methods")
+SECTION_RE = re.compile(
+    r"(?:^|\n)[ \t]*(?:\d+(?:\.\d+)*\.?[ \t]+)?"
+    r"(abstract|introduction|background|materials?\s+and\s+methods?|methods?|experimental(?:\s+section)?|"
+    r"results?(?:\s+and\s+discussion)?|discussion|conclusions?|acknowledge?ments?|references|bibliography)"
+    r"[ \t]*(?=\n|$)",
+    re.I
+)
+
+def _section_name(header: str) -> str:
+    h = re.sub(r"\s+", " ", header).lower()
+    if h.startswith(("material", "method", "experimental")):
+        return "methods"
+    if h.startswith("result"):
+        return "results"
+    if h.startswith("conclusion"):
+        return "conclusions"
+    if h.startswith("acknowledg"):
+        return "acknowledgments"
+    if h in ("references", "bibliography"):
+        return "references"
+    return h
+
+def split_sections(pages: list[dict]) -> list[dict]:
+    """
+    Split page texts at section headings. Returns [{page, section, text}]
+    where text segments of a page concatenate back to the original page text.
+    Text before the first heading is tagged "front".
+    """
+    out = []
+    section = "front"
+    for p in pages:
+        text = p["text"]
+        pos = 0
+        for m in SECTION_RE.finditer(text):
+            if m.start() > pos:
+                out.append({"page": p["page"], "section": section, "text": text[pos:m.start()]})
+            section = _section_name(m.group(1))
+            pos = m.start()
+        if pos < len(text) or not text:
+            out.append({"page": p["page"], "section": section, "text": text[pos:]})
+    return out
+
+register_patterns(__name__)
@@ -1,6 +1,8 @@
 import re
 from typing import List, Tuple
 
+from extract.utils.patterns import register_patterns
+
 PATTERNS: List[Tuple[str, str]] = [
     ("size", r"(particle\s+size|hydrodynamic\s+size|diameter|\bDLS\b|\bTEM\b|[0-9]\s*(?:\.\d+)?\s*nm)"),
     ("zeta", r"(zeta\s+potential|ζ|\bmV\b)"),
@@ -11,10 +13,11 @@ PATTERNS: List[Tuple[str, str]] = [
     ("supplier", r"(supplier|manufacturer|batch|lot|purity|impurit|address|code)"),
 ]
 
+SNIPPET_RES = {name: re.compile(pat, re.I) for name, pat in PATTERNS}
+
 def extract_descriptor_snippets(text: str, window: int = 200, max_snips: int = 14) -> str:
     out = []
-    for name, pat in PATTERNS:
-        rgx = re.compile(pat, re.I)
+    for name, rgx in SNIPPET_RES.items():
         count = 0
         for m in rgx.finditer(text):
             start = max(0, m.start() - window)
@@ -35,3 +38,5 @@ def extract_descriptor_snippets(text: str, window: int = 200, max_snips: int = 1
             final.append(f"[{name}] {snip}")
 
     return "\n".join(final[:max_snips])
+
+register_patterns(__name__)
@@ -0,0 +1,134 @@
+import cProfile
+import csv
+import heapq
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Per-PDF stages, in pipeline order
+STAGES = [
+    "hash", "open", "embedded_metadata", "metadata", "layout_title", "dedup", "triage", "full_text", "table_rows",
+    "nanomaterial", "characterization", "bio_effects", "snippets",
+    "llm", "write",
+]
+
+
+class StageTimer:
+    """
+    Accumulates wall time per stage name for one PDF.
+    """
+
+    def __init__(self):
+        self.times: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - t0
+
+
+def _percentile(sorted_vals: list[float], q: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, int(round(q / 100.0 * (len(sorted_vals) - 1))))
+    return sorted_vals[idx]
+
+
+class RunReport:
+    """
+    Collects per-PDF stage timings. Records are optionally streamed to `path`
+    (CSV if it ends with .csv, JSON lines otherwise) as they arrive.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.records: list[dict] = []
+        self.started = time.perf_counter()
+        self._f = None
+        self._csv = None
+        if path:
+            self._f = open(path, "w", encoding="utf-8", newline="")
+            if path.lower().endswith(".csv"):
+                self._csv = csv.DictWriter(self._f, fieldnames=["file", "total"] + STAGES)
+                self._csv.writeheader()
+
+    def add(self, file_path: str, times: dict[str, float]):
+        rec = {"file": file_path, "total": sum(times.values())}
+        rec.update({s: times.get(s, 0.0) for s in STAGES})
+        self.records.append(rec)
+        if self._csv:
+            self._csv.writerow({k: (f"{v:.6f}" if isinstance(v, float) else v) for k, v in rec.items()})
+        elif self._f:
+            self._f.write(json.dumps(rec) + "\n")
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            self._f = None
+
+    def summary(self, slowest: int = 5) -> str:
+        n = len(self.records)
+        wall = time.perf_counter() - self.started
+        lines = [f"Run summary: {n} PDFs in {wall:.1f}s ({n / wall if wall else 0:.2f} PDFs/s)"]
+        if not n:
+            return lines[0]
+
+        grand = sum(r["total"] for r in self.records) or 1e-9
+        lines.append(f"{'stage':<18}{'total s':>10}{'share':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for s in STAGES + ["total"]:
+            vals = sorted(r[s] for r in self.records)
+            total = sum(vals)
+            if total == 0:
+                continue
+            lines.append(
+                f"{s:<18}{total:>10.2f}{total / grand:>8.0%}"
+                f"{_percentile(vals, 50) * 1000:>10.1f}{_percentile(vals, 95) * 1000:>10.1f}{vals[-1] * 1000:>10.1f}"
+            )
+
+        lines.append(f"Slowest {min(slowest, n)} PDFs:")
+        for r in heapq.nlargest(slowest, self.records, key=lambda r: r["total"]):
+            top_stage = max(STAGES, key=lambda s: r[s])
+            lines.append(f"  {r['total'] * 1000:8.1f} ms  {r['file']}  (mostly {top_stage})")
+        return "\n".join(lines)
+
+
+class SlowestProfiles:
+    """
+    Profiles every PDF with cProfile but keeps only the `n` slowest, which are
+    dumped as .prof files (open with `python -m pstats` or snakeviz).
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self._heap: list[tuple[float, int, str, cProfile.Profile]] = []
+        self._seq = 0
+
+    @contextmanager
+    def profile(self, file_path: str):
+        prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            elapsed = time.perf_counter() - t0
+            self._seq += 1
+            item = (elapsed, self._seq, file_path, prof)
+            if len(self._heap) < self.n:
+                heapq.heappush(self._heap, item)
+            elif elapsed > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def dump(self, out_dir: str) -> list[str]:
+        os.makedirs(out_dir, exist_ok=True)
+        written = []
+        for rank, (elapsed, _, file_path, prof) in enumerate(sorted(self._heap, reverse=True), 1):
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            path = os.path.join(out_dir, f"{rank:02d}_{name}.prof")
+            prof.dump_stats(path)
+            written.append(path)
+        return written
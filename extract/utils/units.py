@@ -0,0 +1,84 @@
+import re
+from typing import Optional
+
+from extract.utils.patterns import register_patterns
+
+# Characterization fields that hold a measured quantity, with the unit
+# implied by the field name (used when the extracted string has none).
+QUANTITY_FIELDS = {
+    "particle_size": "nm",
+    "zeta_potential": "mV",
+    "pdi": None,
+    "purity_percent": "%",
+    "nominal_diameter_nm": "nm",
+    "nominal_length_micron": "µm",
+    "nominal_specific_surface_area_m2_g": "m2/g",
+    "tem_diameter_nm": "nm",
+    "tem_width_nm_median": "nm",
+    "tem_length_nm_median": "nm",
+    "bet_surface_area_m2_g": "m2/g",
+    "dls_mean_diameter_water_nm": "nm",
+    "pdi_water": None,
+    "dls_mean_diameter_medium_nm": "nm",
+    "pdi_medium": None,
+    "zeta_potential_water_mV": "mV",
+    "zeta_potential_medium_mV": "mV",
+    "endotoxins_EU_mg": "EU/mg",
+}
+
+NUM = r"-?\d+(?:\.\d+)?"
+
+# "25", "-25", "10-20", "10to20", "25±3" (whitespace is stripped before matching)
+QUANTITY_RE = re.compile(rf"({NUM})(?:(?:±|\+/-)(\d+(?:\.\d+)?)|(?:-|to)({NUM}))?")
+
+# Case-sensitive on purpose: µm vs µM, mm vs mM
+UNIT_RE = re.compile(r"(nm|µm|um|mV|m2/g|m²/g|EU/mg|%|µg/mL|ug/mL|mg/L|µM|mM)")
+
+WHITESPACE_RE = re.compile(r"\s+")
+IC50_LABEL_RE = re.compile(r"^IC50=?", re.I)
+
+_UNIT_CANON = {"um": "µm", "m²/g": "m2/g", "ug/mL": "µg/mL"}
+
+def _normalize(s: str) -> str:
+    s = s.replace("−", "-").replace("–", "-").replace("—", "-")
+    return WHITESPACE_RE.sub("", s)
+
+def parse_quantity(s: Optional[str], default_unit: Optional[str] = None) -> dict:
+    """
+    Parse strings like "10–20 nm", "−25 mV", "25 ± 3 nm" or "45.2" into
+    {value, low, high, unit}. Ranges get their midpoint as value.
+    Unparseable input gives all None (unit falls back to default_unit only
+    when a number was found).
+    """
+    out = {"value": None, "low": None, "high": None, "unit": None}
+    if s is None:
+        return out
+    s = _normalize(str(s))
+    # "IC50=12µg/mL": the 50 is part of the label, not the measurement
+    s = IC50_LABEL_RE.sub("", s)
+
+    m = QUANTITY_RE.search(s)
+    if not m:
+        return out
+
+    first = float(m.group(1))
+    if m.group(2) is not None:
+        err = float(m.group(2))
+        low, high, value = first - err, first + err, first
+    elif m.group(3) is not None:
+        second = float(m.group(3))
+        low, high = min(first, second), max(first, second)
+        value = (low + high) / 2
+    else:
+        low = high = value = first
+
+    u = UNIT_RE.search(s, m.end())
+    out.update(
+        value=value,
+        low=low,
+        high=high,
+        unit=_UNIT_CANON.get(u.group(1), u.group(1)) if u else default_unit,
+    )
+    return out
+
+register_patterns(__name__)
@@ -0,0 +1,79 @@
+"""
+Import-time regression check for the CLI.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+fails (exit 1) if a module's cumulative import time is over its budget or if
+it pulls in a heavy dependency that should only load when a stage needs it.
+
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget_scale 2   # slow CI machines
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module -> cumulative import budget in milliseconds
+BUDGETS_MS = {
+    "extract.cli": 80,
+    "extract.pipeline.runner": 200,
+}
+
+# Never imported as a side effect of importing the modules above
+HEAVY = ["fitz", "pymupdf", "openpyxl", "requests", "pyarrow", "pandas"]
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """
+    Cumulative import time in microseconds for every module loaded by
+    importing `module` in a fresh interpreter.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m:
+            times[m.group(4)] = int(m.group(2))
+    return times
+
+
+def check(module: str, budget_ms: float, runs: int) -> list[str]:
+    # Best of several runs: import time is noisy, regressions are not.
+    profiles = [import_profile(module) for _ in range(runs)]
+    best_ms = min(p.get(module, 0) for p in profiles) / 1000
+    print(f"{module:<28}{best_ms:>8.1f} ms  (budget {budget_ms:.0f} ms)")
+
+    problems = []
+    if best_ms > budget_ms:
+        problems.append(f"{module}: {best_ms:.1f} ms is over the {budget_ms:.0f} ms budget")
+    loaded = {name.split(".")[0] for name in profiles[0]}
+    for dep in HEAVY:
+        if dep in loaded:
+            problems.append(f"{module}: imports {dep} eagerly")
+    return problems
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fail if CLI import time regresses.")
+    ap.add_argument("--runs", type=int, default=5, help="Fresh interpreters per module (best run counts).")
+    ap.add_argument("--budget_scale", type=float, default=1.0, help="Multiply every budget (for slow machines).")
+    args = ap.parse_args(argv)
+
+    problems = []
+    for module, budget in BUDGETS_MS.items():
+        problems += check(module, budget * args.budget_scale, args.runs)
+    for p in problems:
+        print("FAIL", p)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()